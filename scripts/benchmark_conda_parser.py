@@ -0,0 +1,111 @@
+"""Benchmarks the streaming conda package parser against loading the full package info.
+
+Usage:
+    python scripts/benchmark_conda_parser.py [recorded-package.json ...]
+
+Payloads can be recorded via:
+    curl -L https://api.anaconda.org/package/conda-forge/<package> -o <package>.json
+
+If no payloads are provided, a synthetic payload with the structure of a popular
+conda-forge package is used.
+"""
+
+import json
+import sys
+import timeit
+import tracemalloc
+
+from addict import Dict
+
+from best_of.integrations.conda_integration import read_conda_package
+
+CHUNK_SIZE = 16 * 1024
+
+
+def load_conda_package_fully(content: bytes) -> Dict:
+    # Previous implementation of `update_via_conda_api`
+    conda_info = Dict(json.loads(content))
+    total_downloads = 0
+    if conda_info.files:
+        for package_file in conda_info.files:
+            total_downloads += int(package_file.ndownloads)
+    conda_info.total_downloads = total_downloads
+    return conda_info
+
+
+def create_synthetic_payload(file_count: int = 30000) -> str:
+    files = []
+    for i in range(file_count):
+        version = "1.%d.%d" % (i // 100, i % 100)
+        files.append(
+            {
+                "description": None,
+                "dependencies": {
+                    "depends": [{"name": "python", "specs": [[">=", "3.8"]]}]
+                },
+                "distribution_type": "conda",
+                "basename": "linux-64/package-%s-py_0.tar.bz2" % version,
+                "attrs": {
+                    "subdir": "linux-64",
+                    "build": "py_0",
+                    "depends": ["python >=3.8", "numpy >=1.20"],
+                    "sha256": "0" * 64,
+                    "size": 123456,
+                },
+                "ndownloads": i,
+                "upload_time": "2021-01-01 00:00:00.000000+00:00",
+                "version": version,
+                "md5": "0" * 32,
+                "size": 123456,
+                "type": "conda",
+            }
+        )
+    package = {
+        "name": "package",
+        "summary": "Synthetic package",
+        "created_at": "2016-01-01 00:00:00.000000+00:00",
+        "modified_at": "2021-01-01 00:00:00.000000+00:00",
+        "versions": sorted({package_file["version"] for package_file in files}),
+        "files": files,
+    }
+    return json.dumps(package)
+
+
+def chunks(content: bytes):
+    for start in range(0, len(content), CHUNK_SIZE):
+        yield content[start : start + CHUNK_SIZE]
+
+
+def measure_peak_memory(function) -> float:
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def benchmark(name: str, content: bytes, number: int = 5) -> None:
+    expected = load_conda_package_fully(content).total_downloads
+    assert read_conda_package(chunks(content)).total_downloads == expected
+
+    full_time = timeit.timeit(lambda: load_conda_package_fully(content), number=number)
+    stream_time = timeit.timeit(
+        lambda: read_conda_package(chunks(content)), number=number
+    )
+    # The streamed payload is never held in memory as a whole
+    full_memory = measure_peak_memory(lambda: load_conda_package_fully(content))
+    stream_memory = measure_peak_memory(lambda: read_conda_package(chunks(content)))
+    print(
+        f"{name} ({len(content) / 1024 / 1024:.1f} MB, {expected} downloads): "
+        f"full parse {full_time / number * 1000:.0f} ms / {full_memory:.0f} MB, "
+        f"streaming {stream_time / number * 1000:.0f} ms / {stream_memory:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, "rb") as payload_file:
+                benchmark(path, payload_file.read())
+    else:
+        benchmark("synthetic payload", create_synthetic_payload().encode("utf-8"))
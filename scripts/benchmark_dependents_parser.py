@@ -0,0 +1,87 @@
+"""Benchmarks the streaming dependents parser against the previous BeautifulSoup parser.
+
+Usage:
+    python scripts/benchmark_dependents_parser.py [recorded-page.html ...]
+
+Pages can be recorded via:
+    curl -L https://github.com/<owner>/<repo>/network/dependents -o <repo>.html
+
+If no pages are provided, a synthetic page with the structure of the dependents page is used.
+Requires `beautifulsoup4` for the baseline parser, which is part of the `dev` extras.
+"""
+
+import re
+import sys
+import timeit
+
+from bs4 import BeautifulSoup
+
+from best_of.integrations.github_integration import parse_repo_deps, read_repo_deps
+
+CHUNK_SIZE = 16 * 1024
+
+
+def parse_repo_deps_with_soup(html: str) -> int:
+    # Previous implementation of `parse_repo_deps`
+    repo_deps = 0
+    soup = BeautifulSoup(html, "html.parser")
+    repo_deps_str = soup.find(string=re.compile(r"[0-9,]+\s+Repositories"))
+    if repo_deps_str:
+        count_search = re.search("([0-9,]+)", repo_deps_str, re.IGNORECASE)
+        if count_search:
+            repo_deps += int(count_search.group(1).replace(",", ""))
+    pkg_deps_str = soup.find(string=re.compile(r"[0-9,]+\s+Packages"))
+    if pkg_deps_str:
+        count_search = re.search("([0-9,]+)", pkg_deps_str, re.IGNORECASE)
+        if count_search:
+            repo_deps += int(count_search.group(1).replace(",", ""))
+    return repo_deps
+
+
+def create_synthetic_page() -> str:
+    header = "<html><head><title>Network Dependents</title></head><body>"
+    header += "<div class='header'>" + "<a href='#'>Navigation</a>" * 500 + "</div>"
+    tabs = (
+        "<div class='table-list-header-toggle'>"
+        "<a class='btn-link selected' href='?dependent_type=REPOSITORY'>"
+        "<svg class='octicon'></svg>\n  1,234,567\n  Repositories\n</a>"
+        "<a class='btn-link' href='?dependent_type=PACKAGE'>"
+        "<svg class='octicon'></svg>\n  8,910\n  Packages\n</a></div>"
+    )
+    row = (
+        "<div class='Box-row d-flex flex-items-center'>"
+        "<img class='avatar mr-2' src='https://avatars.githubusercontent.com/u/1'>"
+        "<span><a class='text-bold' href='/owner/repo'>repo</a></span>"
+        "<div class='d-flex'><span class='color-fg-muted'>42</span></div></div>"
+    )
+    return header + tabs + row * 2000 + "</body></html>"
+
+
+def chunks(content: bytes):
+    for start in range(0, len(content), CHUNK_SIZE):
+        yield content[start : start + CHUNK_SIZE]
+
+
+def benchmark(name: str, html: str, number: int = 20) -> None:
+    content = html.encode("utf-8")
+    expected = parse_repo_deps_with_soup(html)
+    assert parse_repo_deps(html) == expected
+    assert read_repo_deps(chunks(content)) == expected
+
+    soup_time = timeit.timeit(lambda: parse_repo_deps_with_soup(html), number=number)
+    stream_time = timeit.timeit(lambda: read_repo_deps(chunks(content)), number=number)
+    print(
+        f"{name} ({len(content) / 1024:.0f} KB, {expected} dependents): "
+        f"BeautifulSoup {soup_time / number * 1000:.2f} ms, "
+        f"streaming {stream_time / number * 1000:.2f} ms "
+        f"({soup_time / max(stream_time, 1e-9):.0f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, encoding="utf-8") as page_file:
+                benchmark(path, page_file.read())
+    else:
+        benchmark("synthetic page", create_synthetic_page())
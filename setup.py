@@ -50,12 +50,9 @@ setup(
         "numpy",
         "click",
         "tqdm",
-        "pybraries",
         "requirements-parser",
-        "pypistats",
         "requests",
         "addict",
-        "beautifulsoup4",
         "PyYAML",
         "python-dateutil",
         "httpx",
@@ -63,6 +60,7 @@ setup(
     # deprecated: dependency_links=dependency_links,
     extras_require={
         # extras can be installed via: pip install package[dev]
+        "http2": ["h2"],
         "dev": [
             "setuptools",
             "wheel",
@@ -77,6 +75,8 @@ setup(
             "isort",
             "lazydocs",
             "types-requests",
+            # Baseline parser of scripts/benchmark_dependents_parser.py
+            "beautifulsoup4",
         ],
     },
     include_package_data=True,
@@ -2,6 +2,7 @@
 
 import logging
 import sys
+from typing import Tuple
 
 import click
 
@@ -31,15 +32,41 @@ def cli() -> None:
     "--github-key",
     "-g",
     required=False,
+    multiple=True,
     type=click.STRING,
-    help="Github API Token (from: https://github.com/settings/tokens)",
+    help="Github API Token (from: https://github.com/settings/tokens). Can be provided multiple times to rotate between tokens.",
+)
+@click.option(
+    "--github-key-file",
+    required=False,
+    type=click.Path(exists=True, dir_okay=False),
+    help="File with one Github API Token per line.",
+)
+@click.option(
+    "--max-workers",
+    "-w",
+    required=False,
+    type=click.IntRange(min=1),
+    help="Number of projects to collect concurrently (overwrites the max_workers configuration).",
 )
 @click.argument("path", type=click.Path(exists=True))
-def generate(path: str, libraries_key: str, github_key: str) -> None:
+def generate(
+    path: str,
+    libraries_key: str,
+    github_key: Tuple[str, ...],
+    github_key_file: str,
+    max_workers: int,
+) -> None:
     """Generates a best-of markdown page from a yaml file."""
     from best_of import generator
 
-    generator.generate_markdown(path, libraries_key, github_key)
+    generator.generate_markdown(
+        path,
+        libraries_key,
+        ",".join(github_key) if github_key else None,
+        max_workers,
+        github_api_key_file=github_key_file,
+    )
 
 
 cli.add_command(generate)
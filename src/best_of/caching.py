@@ -0,0 +1,121 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+CACHE_FILE_NAME = "best-of-cache.sqlite"
+
+
+class PersistentCache:
+    """Key-value store for JSON-serializable values that is persisted across runs.
+
+    All caches share a single SQLite database and are separated by their namespace.
+    Every entry keeps the time it was stored to decide whether it is still fresh.
+
+    Args:
+        connection (sqlite3.Connection): Connection to the shared cache database.
+        lock (threading.Lock): Lock that guards the connection.
+        namespace (str): Namespace of the cache entries.
+    """
+
+    def __init__(
+        self, connection: sqlite3.Connection, lock: threading.Lock, namespace: str
+    ):
+        self._connection = connection
+        self._lock = lock
+        self.namespace = namespace
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Returns the cached value together with the time it was stored, or `None`."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, stored_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), float(row[1])
+
+    def get_fresh(self, key: str, ttl: float) -> Optional[Any]:
+        """Returns the cached value if it was stored less than `ttl` seconds ago."""
+        entry = self.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if time.time() - stored_at > ttl:
+            return None
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), time.time()),
+            )
+            self._connection.commit()
+
+    def touch(self, key: str) -> None:
+        """Marks an entry as fresh without changing its value."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE cache SET stored_at = ? WHERE namespace = ? AND key = ?",
+                (time.time(), self.namespace, key),
+            )
+            self._connection.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+            self._connection.commit()
+
+
+_connection: Optional[sqlite3.Connection] = None
+_connection_lock = threading.Lock()
+_caches: Dict[str, PersistentCache] = {}
+
+
+def configure(cache_folder: Optional[str]) -> None:
+    """Activates the persistent caches in the given folder or deactivates them if `None`."""
+    global _connection
+    with _connection_lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+        _caches.clear()
+
+        if not cache_folder:
+            return
+
+        os.makedirs(cache_folder, exist_ok=True)
+        connection = sqlite3.connect(
+            os.path.join(cache_folder, CACHE_FILE_NAME), check_same_thread=False
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache (namespace TEXT, key TEXT, value TEXT, stored_at REAL, PRIMARY KEY (namespace, key))"
+        )
+        connection.commit()
+        _connection = connection
+
+
+def is_activated() -> bool:
+    return _connection is not None
+
+
+def get_cache(namespace: str) -> Optional[PersistentCache]:
+    """Returns the cache for the namespace or `None` if caching is not activated."""
+    with _connection_lock:
+        if _connection is None:
+            return None
+        if namespace not in _caches:
+            _caches[namespace] = PersistentCache(
+                _connection, _connection_lock, namespace
+            )
+        return _caches[namespace]
@@ -8,6 +8,42 @@ RECENT_ACTIVITY_DAYS = 90
 UP_ARROW_IMAGE = "https://git.io/JtehR"
 LATEST_CHANGES_FILE = "latest-changes.md"
 ENV_LIBRARIES_API_KEY = "LIBRARIES_API_KEY"
+# Maximum number of concurrent requests per host for the asyncio collection
+HOST_CONCURRENCY_LIMITS = {
+    "api.github.com": 10,
+    "github.com": 4,
+    "libraries.io": 4,
+    "pypistats.org": 2,
+    "api.anaconda.org": 10,
+    "api.npmjs.org": 10,
+    "crates.io": 1,
+    "hub.docker.com": 10,
+    "gitlab.com": 10,
+    "greasyfork.org": 4,
+}
+# Time in seconds until the cached metadata of unchanged GitHub repos is requested again
+GITHUB_SNAPSHOT_MAX_AGE = 7 * 24 * 60 * 60
+# Time in seconds until the cached dependents and contributors of GitHub repos are refreshed
+GITHUB_STATS_TTL = 7 * 24 * 60 * 60
+# Time in seconds until the cached package and repo metadata of libraries.io is requested again
+LIBIO_CACHE_TTL = 3 * 24 * 60 * 60
+# Time in seconds until cached responses are revalidated
+DEFAULT_CACHE_TTL = 12 * 60 * 60
+HOST_CACHE_TTLS = {
+    # Download statistics are only updated once a day
+    "pypistats.org": 86400,
+}
+# Request budgets per host as [requests, period in seconds]
+HOST_RATE_LIMITS = {
+    # https://github.com/crflynn/pypistats.org/issues/28#issuecomment-598417650
+    "pypistats.org": [30, 60],
+    # https://libraries.io/api#rate-limit
+    "libraries.io": [60, 60],
+    # https://crates.io/data-access#api
+    "crates.io": [1, 1],
+    # The HTML dependents page is throttled far harder than the API
+    "github.com": [60, 60],
+}
 
 
 def prepare_configuration(cfg: dict) -> Dict:
@@ -85,6 +121,66 @@ def prepare_configuration(cfg: dict) -> Dict:
     if "output_generator" not in config:
         config.output_generator = "markdown-list"
 
+    if "max_workers" not in config:
+        config.max_workers = 1
+
+    if "http2" not in config:
+        config.http2 = False
+
+    if "async_collection" not in config:
+        config.async_collection = False
+
+    if "github_batch_queries" not in config:
+        config.github_batch_queries = False
+
+    if "github_change_probe" not in config:
+        config.github_change_probe = False
+
+    if "github_snapshot_max_age" not in config:
+        config.github_snapshot_max_age = GITHUB_SNAPSHOT_MAX_AGE
+
+    if "github_stats_ttl" not in config:
+        config.github_stats_ttl = GITHUB_STATS_TTL
+
+    if "libio_cache_ttl" not in config:
+        config.libio_cache_ttl = LIBIO_CACHE_TTL
+
+    if "pypi_downloads_file" not in config:
+        config.pypi_downloads_file = None
+
+    if "conda_channeldata" not in config:
+        config.conda_channeldata = False
+
+    if "conda_channeldata_files" not in config:
+        config.conda_channeldata_files = {}
+
+    if "cargo_dump_folder" not in config:
+        config.cargo_dump_folder = None
+
+    # Configured limits overwrite the default limits per host
+    host_concurrency_limits = dict(HOST_CONCURRENCY_LIMITS)
+    if config.host_concurrency_limits:
+        host_concurrency_limits.update(config.host_concurrency_limits)
+    config.host_concurrency_limits = host_concurrency_limits
+
+    # Configured budgets overwrite the default budgets per host
+    host_rate_limits = dict(HOST_RATE_LIMITS)
+    if config.host_rate_limits:
+        host_rate_limits.update(config.host_rate_limits)
+    config.host_rate_limits = host_rate_limits
+
+    if "cache_folder" not in config:
+        config.cache_folder = None
+
+    if "cache_ttl" not in config:
+        config.cache_ttl = DEFAULT_CACHE_TTL
+
+    # Configured TTLs overwrite the default TTLs per host
+    host_cache_ttls = dict(HOST_CACHE_TTLS)
+    if config.host_cache_ttls:
+        host_cache_ttls.update(config.host_cache_ttls)
+    config.host_cache_ttls = host_cache_ttls
+
     if "allowed_licenses" not in config:
         config.allowed_licenses = []
         from best_of.license import LICENSES
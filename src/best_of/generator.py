@@ -3,13 +3,13 @@ import logging
 import os
 from collections import OrderedDict
 from datetime import datetime
-from typing import Tuple
+from typing import Optional, Tuple
 
 import pandas as pd
 import yaml
 from addict import Dict
 
-from best_of import default_config, utils
+from best_of import caching, default_config, http_client, throttling, utils
 
 log = logging.getLogger(__name__)
 
@@ -77,7 +77,11 @@ def load_extension_script(extension_script_path: str) -> None:
 
 
 def generate_markdown(
-    projects_yaml_path: str, libraries_api_key: str = None, github_api_key: str = None
+    projects_yaml_path: str,
+    libraries_api_key: Optional[str] = None,
+    github_api_key: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    github_api_key_file: Optional[str] = None,
 ) -> None:
     try:
         # Set libraries api key
@@ -89,15 +93,34 @@ def generate_markdown(
                 "We recommend to activate the libraries.io integration by providing a valid API key from https://libraries.io/api"
             )
 
+        if github_api_key_file:
+            os.environ["GITHUB_API_KEY_FILE"] = github_api_key_file
+
         if github_api_key:
+            # Multiple comma-separated tokens are rotated by their remaining quota
             os.environ["GITHUB_API_KEY"] = github_api_key
-        else:
+        elif not github_api_key_file:
             log.warning(
                 "No Github API key provided. We recommend to activate the Github integration by providing a valid API key from https://github.com/settings/tokens"
             )
 
         config, projects, categories, labels = parse_projects_yaml(projects_yaml_path)
 
+        if max_workers:
+            config.max_workers = max_workers
+
+        throttling.configure_rate_limits(config.host_rate_limits)
+        # Every concurrent worker should be able to keep its connection alive
+        http_client.configure(
+            pool_maxsize=max(
+                int(config.max_workers), *config.host_concurrency_limits.values()
+            ),
+            http2=bool(config.http2),
+            cache_ttls=config.host_cache_ttls,
+            default_cache_ttl=float(config.cache_ttl),
+        )
+        caching.configure(config.cache_folder)
+
         if config.extension_script:
             load_extension_script(config.extension_script)
 
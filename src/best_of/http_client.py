@@ -0,0 +1,603 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from best_of import caching, throttling
+
+log = logging.getLogger(__name__)
+
+# Status codes of transient errors that are worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Connect and read timeout in seconds
+DEFAULT_TIMEOUT = (10.0, 60.0)
+# Number of kept-alive connections per host
+DEFAULT_POOL_MAXSIZE = 10
+# Time in seconds until cached responses are revalidated
+DEFAULT_CACHE_TTL = 12 * 60 * 60
+
+# Responses of the shared session (HTTP/1.1) or the HTTP/2 client
+Response = Union[requests.Response, httpx.Response]
+
+
+class RetryPolicy:
+    """Decides if and how long to wait before a failed request is retried.
+
+    The wait time is taken from the `Retry-After` or `X-RateLimit-Reset` headers if the
+    host provides them. Otherwise, an exponential backoff with jitter is used.
+
+    Args:
+        max_retries (int, optional): Maximum number of retries per request.
+        backoff_factor (float, optional): Base wait time in seconds for the exponential backoff.
+        max_backoff (float, optional): Maximum wait time in seconds for the exponential backoff.
+        max_wait_time (float, optional): Maximum wait time in seconds requested via headers.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 5,
+        backoff_factor: float = 1.0,
+        max_backoff: float = 60.0,
+        max_wait_time: float = 3600.0,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_wait_time = max_wait_time
+
+    def is_rate_limited(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        content: Optional[bytes] = None,
+    ) -> bool:
+        if status_code in {403, 429}:
+            # GitHub responds with 403 if the rate limit is exceeded
+            return (
+                headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers
+            )
+        # GitHub GraphQL reports an exceeded rate limit via the errors of a 200 response
+        return (
+            status_code == 200
+            and headers.get("X-RateLimit-Remaining") == "0"
+            and content is not None
+            and has_rate_limited_error(content)
+        )
+
+    def should_retry(
+        self,
+        status_code: int,
+        headers: Mapping[str, str],
+        content: Optional[bytes] = None,
+    ) -> bool:
+        """Returns `True` if the failed request should be retried.
+
+        Args:
+            status_code (int): Status code of the response.
+            headers (Mapping): Headers of the response.
+            content (bytes, optional): Body of the response, only required for
+                rate limits that are reported in the body.
+        """
+        return status_code in RETRY_STATUS_CODES or self.is_rate_limited(
+            status_code, headers, content
+        )
+
+    def get_wait_time(
+        self, attempt: int, headers: Optional[Mapping[str, str]] = None
+    ) -> float:
+        """Returns the time in seconds to wait before the next attempt.
+
+        Args:
+            attempt (int): Number of the failed attempt, starting with 0.
+            headers (Mapping, optional): Headers of the failed response.
+        """
+        if headers:
+            retry_after = headers.get("Retry-After")
+            if retry_after:
+                wait_time = parse_retry_after(retry_after)
+                if wait_time is not None:
+                    return min(self.max_wait_time, wait_time)
+
+            rate_limit_reset = headers.get("X-RateLimit-Reset")
+            if headers.get("X-RateLimit-Remaining") == "0" and rate_limit_reset:
+                try:
+                    wait_time = float(rate_limit_reset) - time.time()
+                    return min(self.max_wait_time, max(0.0, wait_time) + 1)
+                except ValueError:
+                    pass
+
+        backoff = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        # Jitter prevents that concurrent requests are retried at the same time
+        return random.uniform(backoff / 2, backoff)
+
+
+def has_rate_limited_error(content: bytes) -> bool:
+    """Returns `True` if the GraphQL response contains a `RATE_LIMITED` error."""
+    try:
+        body = json.loads(content)
+    except ValueError:
+        return False
+    if not isinstance(body, dict):
+        return False
+    return any(
+        isinstance(error, dict) and error.get("type") == "RATE_LIMITED"
+        for error in body.get("errors") or []
+    )
+
+
+def is_graphql_response_cacheable(response: Response) -> bool:
+    """GraphQL reports failed queries (e.g. an exceeded rate limit) via the body of 200 responses."""
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and not body.get("errors") and bool(body.get("data"))
+
+
+def get_rate_limit_content(response: Response, stream: bool) -> Optional[bytes]:
+    """Returns the body of responses that might report an exceeded rate limit."""
+    if (
+        stream
+        or response.status_code != 200
+        or response.headers.get("X-RateLimit-Remaining") != "0"
+    ):
+        return None
+    return response.content
+
+
+def parse_retry_after(retry_after: str) -> Optional[float]:
+    """Parses the `Retry-After` header, which is either in seconds or an HTTP date."""
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_date = parsedate_to_datetime(retry_after)
+        if retry_date.tzinfo is None:
+            retry_date = retry_date.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_date - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+_timeout: Tuple[float, float] = DEFAULT_TIMEOUT
+_pool_maxsize = DEFAULT_POOL_MAXSIZE
+_http2 = False
+_session: Optional[requests.Session] = None
+_http2_client: Optional[httpx.Client] = None
+_session_lock = threading.Lock()
+_default_cache_ttl: float = DEFAULT_CACHE_TTL
+_cache_ttls: Dict[str, float] = {}
+
+
+def is_http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+
+        return True
+    except ImportError:
+        return False
+
+
+def configure(
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+    http2: bool = False,
+    cache_ttls: Optional[Dict[str, float]] = None,
+    default_cache_ttl: float = DEFAULT_CACHE_TTL,
+) -> None:
+    """Configures the connection pool that is shared by all integrations.
+
+    Args:
+        pool_maxsize (int, optional): Number of kept-alive connections per host.
+            Should be at least the number of concurrent requests to a single host.
+        timeout (tuple, optional): Connect and read timeout in seconds.
+        http2 (bool, optional): If `True`, requests are sent via HTTP/2, so that concurrent
+            requests to the same host are multiplexed over a single connection.
+            Requires the `h2` package.
+        cache_ttls (dict, optional): Time in seconds per host until cached responses are revalidated.
+        default_cache_ttl (float, optional): Time in seconds until cached responses of other hosts are revalidated.
+    """
+    global _session, _http2_client, _pool_maxsize, _timeout, _http2, _default_cache_ttl
+    if http2 and not is_http2_available():
+        log.warning(
+            "HTTP/2 requires the h2 package (pip install best-of[http2]). Falling back to HTTP/1.1."
+        )
+        http2 = False
+
+    with _session_lock:
+        _pool_maxsize = max(1, int(pool_maxsize))
+        _timeout = timeout
+        _http2 = http2
+        _default_cache_ttl = float(default_cache_ttl)
+        _cache_ttls.clear()
+        _cache_ttls.update(cache_ttls or {})
+        if _session is not None:
+            _session.close()
+            _session = None
+        if _http2_client is not None:
+            _http2_client.close()
+            _http2_client = None
+
+
+def get_session() -> requests.Session:
+    """Returns the shared session that keeps connections alive between requests."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=_pool_maxsize)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["Accept-Encoding"] = "gzip, deflate"
+            _session = session
+        return _session
+
+
+def get_http2_client() -> httpx.Client:
+    """Returns the shared `httpx` client that multiplexes requests via HTTP/2."""
+    global _http2_client
+    with _session_lock:
+        if _http2_client is None:
+            connect_timeout, read_timeout = _timeout
+            _http2_client = httpx.Client(
+                http2=True,
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                headers={"Accept-Encoding": "gzip, deflate"},
+                follow_redirects=True,
+            )
+        return _http2_client
+
+
+def create_async_client(**kwargs: Any) -> httpx.AsyncClient:
+    """Creates an `httpx` client with the same timeouts as the shared session.
+
+    The number of connections is not limited by the client, since the concurrent requests
+    are already capped per host by the `HostConcurrencyLimiter` of the collection.
+    """
+    connect_timeout, read_timeout = _timeout
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=None),
+        headers={"Accept-Encoding": "gzip, deflate"},
+        follow_redirects=True,
+        http2=_http2,
+        **kwargs,
+    )
+
+
+def send(method: str, url: str, **kwargs: Any) -> Response:
+    """Sends a single request via the shared session or the shared HTTP/2 client.
+
+    With `stream=True`, the body is not read before returning the response.
+    """
+    if _http2:
+        client = get_http2_client()
+        stream = kwargs.pop("stream", False)
+        return client.send(client.build_request(method, url, **kwargs), stream=stream)
+
+    kwargs.setdefault("timeout", _timeout)
+    return get_session().request(method, url, **kwargs)
+
+
+def get_cache_key(method: str, url: str, **kwargs: Any) -> str:
+    """Returns the cache key of a request based on the method, URL, and body."""
+    request_data = json.dumps(
+        {
+            "method": method.upper(),
+            "url": url,
+            "params": kwargs.get("params"),
+            "json": kwargs.get("json"),
+            "data": kwargs.get("data"),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(request_data.encode("utf-8")).hexdigest()
+
+
+def get_cache_ttl(host: str) -> float:
+    return float(_cache_ttls.get(host, _default_cache_ttl))
+
+
+def create_cache_entry(response: Response) -> dict:
+    headers = {
+        key.lower(): value
+        for key, value in response.headers.items()
+        # The content is stored decoded
+        if key.lower()
+        not in {"content-encoding", "content-length", "transfer-encoding"}
+    }
+    return {
+        "status_code": response.status_code,
+        "headers": headers,
+        "content": base64.b64encode(response.content).decode("ascii"),
+    }
+
+
+def create_cached_response(cache_entry: dict, method: str, url: str) -> httpx.Response:
+    return httpx.Response(
+        cache_entry["status_code"],
+        headers=cache_entry["headers"],
+        content=base64.b64decode(cache_entry["content"]),
+        request=httpx.Request(method, url),
+        extensions={"from_cache": True},
+    )
+
+
+def is_cached(response: Response) -> bool:
+    """Returns `True` if the response was loaded from the cache.
+
+    The headers of cached responses (e.g. rate limits) might be outdated.
+    """
+    return isinstance(response, httpx.Response) and bool(
+        response.extensions.get("from_cache")
+    )
+
+
+def add_validators(headers: Optional[Mapping[str, str]], cache_entry: dict) -> dict:
+    """Adds the conditional request headers for a stale cache entry."""
+    headers = dict(headers or {})
+    if "etag" in cache_entry["headers"]:
+        headers["If-None-Match"] = cache_entry["headers"]["etag"]
+    if "last-modified" in cache_entry["headers"]:
+        headers["If-Modified-Since"] = cache_entry["headers"]["last-modified"]
+    return headers
+
+
+class CachedRequest:
+    """Looks up a request in the response cache and stores its response.
+
+    Fresh entries are returned without a request, stale entries are revalidated
+    via `If-None-Match` and `If-Modified-Since` if the host provided validators.
+    """
+
+    def __init__(self, method: str, url: str, kwargs: dict):
+        self.method = method
+        self.url = url
+        self.kwargs = kwargs
+        self.cache = caching.get_cache("http")
+        self.key = ""
+        self.entry: Optional[dict] = None
+        self.fresh = False
+
+        if self.cache is None:
+            return
+
+        self.key = get_cache_key(method, url, **kwargs)
+        cached = self.cache.get(self.key)
+        if cached is None:
+            return
+
+        self.entry, stored_at = cached
+        if time.time() - stored_at <= get_cache_ttl(urlparse(url).netloc):
+            self.fresh = True
+        else:
+            self.kwargs["headers"] = add_validators(
+                self.kwargs.get("headers"), self.entry
+            )
+
+    def get_cached_response(self) -> Optional[httpx.Response]:
+        if self.fresh and self.entry:
+            return create_cached_response(self.entry, self.method, self.url)
+        return None
+
+    def process_response(
+        self,
+        response: Response,
+        is_cacheable: Optional[Callable[[Response], bool]] = None,
+    ) -> Response:
+        if self.cache is None:
+            return response
+
+        if response.status_code == 304 and self.entry:
+            # Not modified since it was cached
+            self.cache.touch(self.key)
+            return create_cached_response(self.entry, self.method, self.url)
+
+        if (
+            response.status_code == 200
+            # Responses at the exhausted rate limit might only contain an error
+            and response.headers.get("X-RateLimit-Remaining") != "0"
+            and (is_cacheable is None or is_cacheable(response))
+        ):
+            self.cache.set(self.key, create_cache_entry(response))
+        return response
+
+
+def send_with_retries(
+    method: str, url: str, retry_policy: Optional[RetryPolicy] = None, **kwargs: Any
+) -> Response:
+    retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+    host = urlparse(url).netloc
+    attempt = 0
+    while True:
+        throttling.acquire(host)
+        try:
+            response = send(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout, httpx.TransportError) as ex:
+            if attempt >= retry_policy.max_retries:
+                raise
+            wait_time = retry_policy.get_wait_time(attempt)
+            log.info(
+                f"Request to {host} failed ({type(ex).__name__}). Retrying in {wait_time:.1f} seconds."
+            )
+        else:
+            if attempt >= retry_policy.max_retries or not retry_policy.should_retry(
+                response.status_code,
+                response.headers,
+                get_rate_limit_content(response, kwargs.get("stream", False)),
+            ):
+                return response
+            # Releases the connection of streamed responses
+            response.close()
+            wait_time = retry_policy.get_wait_time(attempt, response.headers)
+            log.info(
+                f"Request to {host} failed ({response.status_code}). Retrying in {wait_time:.1f} seconds."
+            )
+        time.sleep(wait_time)
+        attempt += 1
+
+
+def request(
+    method: str,
+    url: str,
+    retry_policy: Optional[RetryPolicy] = None,
+    use_cache: bool = True,
+    is_cacheable: Optional[Callable[[Response], bool]] = None,
+    **kwargs: Any,
+) -> Response:
+    """Sends a request with the rate limit of the host and retries transient failures.
+
+    If the response cache is activated, successful responses are cached per
+    method, URL, and body.
+
+    Args:
+        method (str): HTTP method.
+        url (str): Requested URL.
+        retry_policy (RetryPolicy, optional): Retry policy, uses the default policy if not provided.
+        use_cache (bool, optional): If `False`, the response cache is not used for this request.
+        is_cacheable (Callable, optional): Decides if a successful response is cached, e.g. to
+            skip responses that report errors in the body.
+        **kwargs: Additional arguments passed to the request method of the client
+            (e.g. `params`, `json`, `headers`).
+    """
+    if not use_cache:
+        return send_with_retries(method, url, retry_policy, **kwargs)
+
+    cached_request = CachedRequest(method, url, kwargs)
+    cached_response = cached_request.get_cached_response()
+    if cached_response is not None:
+        return cached_response
+
+    response = send_with_retries(method, url, retry_policy, **cached_request.kwargs)
+    return cached_request.process_response(response, is_cacheable)
+
+
+def get(url: str, **kwargs: Any) -> Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> Response:
+    return request("POST", url, **kwargs)
+
+
+def stream(
+    url: str, retry_policy: Optional[RetryPolicy] = None, **kwargs: Any
+) -> Response:
+    """Sends a GET request and returns the response before its body is read.
+
+    The body can be read incrementally via `iter_chunks`, which allows to stop reading
+    once the required data is found. Streamed responses are not cached and must be
+    closed by the caller.
+    """
+    return send_with_retries("GET", url, retry_policy, stream=True, **kwargs)
+
+
+def iter_chunks(response: Response, chunk_size: int = 16 * 1024) -> Iterator[bytes]:
+    """Iterates over the decoded body of a streamed response."""
+    if isinstance(response, httpx.Response):
+        return response.iter_bytes(chunk_size)
+    return response.iter_content(chunk_size)
+
+
+async def send_with_retries_async(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    retry_policy: Optional[RetryPolicy] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+    host = urlparse(url).netloc
+    attempt = 0
+    while True:
+        await throttling.acquire_async(host)
+        try:
+            stream = kwargs.get("stream", False)
+            request_kwargs = {
+                key: value for key, value in kwargs.items() if key != "stream"
+            }
+            response = await client.send(
+                client.build_request(method, url, **request_kwargs), stream=stream
+            )
+        except httpx.TransportError as ex:
+            if attempt >= retry_policy.max_retries:
+                raise
+            wait_time = retry_policy.get_wait_time(attempt)
+            log.info(
+                f"Request to {host} failed ({type(ex).__name__}). Retrying in {wait_time:.1f} seconds."
+            )
+        else:
+            if attempt >= retry_policy.max_retries or not retry_policy.should_retry(
+                response.status_code,
+                response.headers,
+                get_rate_limit_content(response, stream),
+            ):
+                return response
+            await response.aclose()
+            wait_time = retry_policy.get_wait_time(attempt, response.headers)
+            log.info(
+                f"Request to {host} failed ({response.status_code}). Retrying in {wait_time:.1f} seconds."
+            )
+        await asyncio.sleep(wait_time)
+        attempt += 1
+
+
+async def request_async(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    retry_policy: Optional[RetryPolicy] = None,
+    use_cache: bool = True,
+    is_cacheable: Optional[Callable[[Response], bool]] = None,
+    **kwargs: Any,
+) -> Response:
+    """Asynchronous variant of `request` that uses the given `httpx` client."""
+    if not use_cache:
+        return await send_with_retries_async(
+            client, method, url, retry_policy, **kwargs
+        )
+
+    # The cache is backed by sqlite, so it is read and written outside of the event loop
+    loop = asyncio.get_event_loop()
+    cached_request = await loop.run_in_executor(
+        None, CachedRequest, method, url, kwargs
+    )
+    cached_response = cached_request.get_cached_response()
+    if cached_response is not None:
+        return cached_response
+
+    response = await send_with_retries_async(
+        client, method, url, retry_policy, **cached_request.kwargs
+    )
+    return await loop.run_in_executor(
+        None, cached_request.process_response, response, is_cacheable
+    )
+
+
+async def stream_async(
+    client: httpx.AsyncClient,
+    url: str,
+    retry_policy: Optional[RetryPolicy] = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Asynchronous variant of `stream`, the body can be read via `aiter_bytes`."""
+    return await send_with_retries_async(
+        client, "GET", url, retry_policy, stream=True, **kwargs
+    )
@@ -1,7 +1,12 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Callable, List
 
 from addict import Dict
 
+from best_of.integrations import libio_integration
+from best_of.throttling import HostConcurrencyLimiter
+
 
 class BaseIntegration(ABC):
     @property
@@ -10,6 +15,24 @@ class BaseIntegration(ABC):
         """Returns the name of the integration."""
         return NotImplemented
 
+    @property
+    def hosts(self) -> List[str]:
+        """Returns the upstream hosts that are requested by the integration."""
+        return []
+
+    def get_requested_hosts(self, project_info: Dict) -> List[str]:
+        """Returns the hosts that are requested to update the given project.
+
+        Only these hosts are limited while the project is updated within an asyncio
+        event loop. libraries.io is only requested if an api key is set.
+
+        Args:
+            project_info (Dict): Collected project metadata.
+        """
+        if libio_integration.is_activated():
+            return self.hosts
+        return [host for host in self.hosts if host != libio_integration.LIBIO_HOST]
+
     @abstractmethod
     def update_project_info(self, project_info: Dict) -> None:
         """Updates the project metadata by fetching information from the package manager.
@@ -19,6 +42,75 @@ class BaseIntegration(ABC):
         """
         pass
 
+    @property
+    def supports_batch_update(self) -> bool:
+        """Returns `True` if the integration updates all projects at once via `update_projects_info`."""
+        return (
+            type(self).update_projects_info is not BaseIntegration.update_projects_info
+        )
+
+    def prepare_project_info(self, project_info: Dict) -> None:
+        """Updates the metadata that batch-capable integrations still request per project.
+
+        It is called for every project with a `<name>_id` in the per-project stage, at the
+        position of the integration. This keeps the order in which the integrations fill
+        the metadata. The bulk requests follow in `update_projects_info`.
+
+        Args:
+            project_info (Dict): Collected project metadata.
+        """
+        pass
+
+    def update_projects_info(self, projects_info: List[Dict]) -> None:
+        """Updates the metadata of multiple projects at once.
+
+        Integrations can overwrite this method to request the metadata of all projects
+        via bulk endpoints of the package manager. It is called once with all projects
+        that have a `<name>_id`, after the per-project integrations are applied.
+        The default implementation updates every project via `update_project_info`.
+
+        Args:
+            projects_info (List[Dict]): Collected metadata of all projects with a `<name>_id`.
+        """
+        for project_info in projects_info:
+            self.update_project_info(project_info)
+
+    async def update_project_info_async(
+        self, project_info: Dict, limiter: HostConcurrencyLimiter
+    ) -> None:
+        """Updates the project metadata from within an asyncio event loop.
+
+        The default implementation runs `update_project_info` in the executor of the event loop
+        while holding a connection slot for every host that is requested for the project. It is skipped
+        for projects without a `<name>_id`. Since the update is synchronous, the concurrency is
+        bound by the executor, which is sized to the sum of the host limits. Integrations can
+        override this method to send their requests natively within the event loop, as done for
+        the GitHub metadata.
+
+        Args:
+            project_info (Dict): Collected project metadata.
+            limiter (HostConcurrencyLimiter): Limits the concurrent requests per host.
+        """
+        await self.run_in_executor(self.update_project_info, project_info, limiter)
+
+    async def prepare_project_info_async(
+        self, project_info: Dict, limiter: HostConcurrencyLimiter
+    ) -> None:
+        """Runs `prepare_project_info` from within an asyncio event loop."""
+        await self.run_in_executor(self.prepare_project_info, project_info, limiter)
+
+    async def run_in_executor(
+        self,
+        update: Callable[[Dict], None],
+        project_info: Dict,
+        limiter: HostConcurrencyLimiter,
+    ) -> None:
+        if not project_info.get(self.name + "_id"):
+            return
+
+        async with limiter.limit(*self.get_requested_hosts(project_info)):
+            await asyncio.get_event_loop().run_in_executor(None, update, project_info)
+
     @abstractmethod
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         """Generates markdown details for the given project.
@@ -1,10 +1,14 @@
 import logging
+import os
+import threading
+from typing import List, Optional
 from urllib.parse import quote
 
-import requests
+import pandas as pd
 from addict import Dict
+from dateutil.parser import parse
 
-from best_of import utils
+from best_of import http_client, utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
 from best_of.integrations import libio_integration
 from best_of.integrations.base_integration import BaseIntegration
@@ -12,11 +16,188 @@ from best_of.integrations.base_integration import BaseIntegration
 log = logging.getLogger(__name__)
 
 
+def get_dump_file(dump_folder: str, file_name: str) -> str:
+    # The tables are located in the data folder of the extracted dump
+    data_file = os.path.join(dump_folder, "data", file_name)
+    if os.path.exists(data_file):
+        return data_file
+    return os.path.join(dump_folder, file_name)
+
+
+def load_recent_downloads(dump_folder: str, version_crate_ids: pd.Series) -> pd.Series:
+    """Sums the downloads of the last 90 days per crate from the version downloads.
+
+    Args:
+        dump_folder (str): Folder of the extracted crates.io database dump.
+        version_crate_ids (pd.Series): The crate id per version id.
+
+    Returns:
+        The recent downloads per crate id.
+    """
+    # The table is large, only the downloads of the requested crates are kept
+    downloads_chunks = []
+    for chunk in pd.read_csv(
+        get_dump_file(dump_folder, "version_downloads.csv"),
+        usecols=["version_id", "downloads", "date"],
+        chunksize=1_000_000,
+    ):
+        downloads_chunks.append(
+            chunk[chunk["version_id"].isin(version_crate_ids.index)]
+        )
+    version_downloads_df = pd.concat(downloads_chunks)
+    if version_downloads_df.empty:
+        return pd.Series(dtype="int64")
+
+    dates = pd.to_datetime(version_downloads_df["date"])
+    version_downloads_df = version_downloads_df[
+        dates > dates.max() - pd.Timedelta(days=90)
+    ]
+    return version_downloads_df.groupby(
+        version_downloads_df["version_id"].map(version_crate_ids)
+    )["downloads"].sum()
+
+
+def load_crates_dump(dump_folder: str, cargo_ids: List[str]) -> dict:
+    """Indexes the crates of the extracted crates.io database dump.
+
+    The dump can be downloaded from https://static.crates.io/db-dump.tar.gz.
+    Only the versions and downloads of the requested crates are kept.
+
+    Returns:
+        The crate info per crate name.
+    """
+    crates_df = pd.read_csv(
+        get_dump_file(dump_folder, "crates.csv"),
+        usecols=["id", "name", "description", "created_at", "homepage"],
+    )
+    crates_df = crates_df[crates_df["name"].isin(cargo_ids)]
+
+    crate_downloads_df = pd.read_csv(
+        get_dump_file(dump_folder, "crate_downloads.csv"),
+        usecols=["crate_id", "downloads"],
+    ).set_index("crate_id")
+
+    versions_df = pd.read_csv(
+        get_dump_file(dump_folder, "versions.csv"),
+        usecols=["id", "crate_id", "num", "created_at", "yanked"],
+    )
+    versions_df = versions_df[versions_df["crate_id"].isin(crates_df["id"])]
+    recent_downloads = load_recent_downloads(
+        dump_folder, versions_df.set_index("id")["crate_id"]
+    )
+
+    versions_df = versions_df[
+        versions_df["yanked"].astype(str).str.lower() != "t"
+    ].sort_values("created_at")
+    release_counts = versions_df.groupby("crate_id").size()
+    latest_versions = versions_df.groupby("crate_id").last()
+
+    crates = {}
+    for crate in crates_df.to_dict("records"):
+        crate_info = Dict(
+            {
+                key: value
+                for key, value in crate.items()
+                # Missing values are NaN
+                if isinstance(value, str) or pd.notna(value)
+            }
+        )
+        if crate["id"] in crate_downloads_df.index:
+            crate_info.downloads = int(crate_downloads_df.loc[crate["id"], "downloads"])
+        if crate["id"] in recent_downloads.index:
+            crate_info.recent_downloads = int(recent_downloads[crate["id"]])
+        if crate["id"] in latest_versions.index:
+            crate_info.release_count = int(release_counts[crate["id"]])
+            crate_info.newest_version = str(latest_versions.loc[crate["id"], "num"])
+            crate_info.newest_version_created_at = str(
+                latest_versions.loc[crate["id"], "created_at"]
+            )
+        crates[crate["name"]] = crate_info
+    return crates
+
+
+_dump_folder: Optional[str] = None
+_dumped_crates: dict = {}
+_dumped_crates_lock = threading.Lock()
+
+
+def configure(dump_folder: Optional[str] = None) -> None:
+    """Sets the folder of the extracted crates.io database dump.
+
+    If `None`, the crates are requested from the crates.io api.
+    """
+    global _dump_folder
+    with _dumped_crates_lock:
+        _dump_folder = dump_folder
+        _dumped_crates.clear()
+
+
+def prefetch_crates_dump(projects_info: List[Dict]) -> None:
+    """Loads the crates of all projects from the crates.io database dump."""
+    if not _dump_folder:
+        return
+
+    cargo_ids = [
+        project_info["cargo_id"]
+        for project_info in projects_info
+        if project_info.get("cargo_id")
+    ]
+    if not cargo_ids:
+        return
+
+    try:
+        crates = load_crates_dump(_dump_folder, cargo_ids)
+    except Exception as ex:
+        log.warning(
+            "Unable to load the crates.io database dump, the crates.io api is used instead: "
+            + _dump_folder,
+            exc_info=ex,
+        )
+        return
+
+    log.info("Loaded " + str(len(crates)) + " crates from the crates.io database dump.")
+    with _dumped_crates_lock:
+        _dumped_crates.update(crates)
+
+
+def get_dumped_crate(cargo_id: str) -> Optional[Dict]:
+    with _dumped_crates_lock:
+        return _dumped_crates.get(cargo_id)
+
+
+def update_monthly_downloads(project_info: Dict, recent_downloads: int) -> None:
+    # recent downloads == downloads of last 90 days
+    project_info.cargo_monthly_downloads = int(recent_downloads) / 3
+
+    if not project_info.monthly_downloads:
+        project_info.monthly_downloads = 0
+
+    project_info.monthly_downloads += project_info.cargo_monthly_downloads
+
+
+def update_description(project_info: Dict, description: str) -> None:
+    if (
+        not project_info.description
+        or len(project_info.description) < MIN_PROJECT_DESC_LENGTH
+    ) and description:
+        project_info.description = description
+
+
 class CargoIntegration(BaseIntegration):
     @property
     def name(self) -> str:
         return "cargo"
 
+    @property
+    def hosts(self) -> List[str]:
+        return ["libraries.io", "crates.io"]
+
+    def get_requested_hosts(self, project_info: Dict) -> List[str]:
+        hosts = super().get_requested_hosts(project_info)
+        if get_dumped_crate(project_info.cargo_id) is not None:
+            hosts = [host for host in hosts if host != "crates.io"]
+        return hosts
+
     def update_project_info(self, project_info: Dict) -> None:
         if not project_info.cargo_id:
             return
@@ -27,9 +208,60 @@ class CargoIntegration(BaseIntegration):
         if libio_integration.is_activated():
             libio_integration.update_package_via_libio("cargo", project_info)
 
+        if _dump_folder and _dumped_crates:
+            crate = get_dumped_crate(project_info.cargo_id)
+            if crate is not None:
+                self.update_via_crates_dump(project_info, crate)
+                return
+            log.info(
+                "Unable to find crate in the crates.io database dump, the crates.io api is used instead: "
+                + project_info.cargo_id
+            )
+
+        self.update_via_cargo_api(project_info)
+
+    def update_via_crates_dump(self, project_info: Dict, crate: Dict) -> None:
+        if crate.recent_downloads:
+            update_monthly_downloads(project_info, crate.recent_downloads)
+
+        if crate.downloads:
+            project_info.cargo_total_downloads = int(crate.downloads)
+
+        update_description(project_info, crate.description)
+
+        if not project_info.homepage and crate.homepage:
+            project_info.homepage = crate.homepage
+
+        if crate.release_count and (
+            not project_info.release_count
+            or int(project_info.release_count) < crate.release_count
+        ):
+            project_info.release_count = crate.release_count
+
+        try:
+            if crate.created_at:
+                created_at = parse(str(crate.created_at), ignoretz=True)
+                if not project_info.created_at or project_info.created_at > created_at:
+                    project_info.created_at = created_at
+
+            if crate.newest_version_created_at:
+                updated_at = parse(str(crate.newest_version_created_at), ignoretz=True)
+                project_info.cargo_latest_release_published_at = updated_at
+                if not project_info.updated_at or project_info.updated_at < updated_at:
+                    project_info.updated_at = updated_at
+                if not project_info.latest_stable_release_number:
+                    project_info.latest_stable_release_number = crate.newest_version
+                    project_info.latest_stable_release_published_at = updated_at
+        except Exception as ex:
+            log.warning(
+                "Failed to parse timestamps of crate: " + project_info.cargo_id,
+                exc_info=ex,
+            )
+
+    def update_via_cargo_api(self, project_info: Dict) -> None:
         # Get monthly downloads
         try:
-            request = requests.get(
+            request = http_client.get(
                 "https://crates.io/api/v1/crates/"
                 + quote(project_info.cargo_id, safe="")
             )
@@ -51,26 +283,16 @@ class CargoIntegration(BaseIntegration):
                 return
 
             if cargo_packaged_details.crate.recent_downloads:
-                # recent downloads == downloads of last 90 days
-                project_info.cargo_monthly_downloads = (
-                    int(cargo_packaged_details.crate.recent_downloads) / 3
+                update_monthly_downloads(
+                    project_info, cargo_packaged_details.crate.recent_downloads
                 )
 
-                if not project_info.monthly_downloads:
-                    project_info.monthly_downloads = 0
-
-                project_info.monthly_downloads += project_info.cargo_monthly_downloads
-
             if cargo_packaged_details.crate.downloads:
                 project_info.cargo_total_downloads = int(
                     cargo_packaged_details.crate.downloads
                 )
 
-            if (
-                not project_info.description
-                or len(project_info.description) < MIN_PROJECT_DESC_LENGTH
-            ) and cargo_packaged_details.crate.description:
-                project_info.description = cargo_packaged_details.crate.description
+            update_description(project_info, cargo_packaged_details.crate.description)
 
             # TODO: use other info like created_at, updated_at, homepage, newest_version, license
 
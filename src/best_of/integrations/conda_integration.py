@@ -1,23 +1,347 @@
+import codecs
+import json
 import logging
+import re
+import threading
 from datetime import datetime
+from typing import Any, Iterable, List, Optional, Tuple
 
-import requests
 from addict import Dict
 from dateutil.parser import parse
 
-from best_of import utils
+from best_of import http_client, utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
 from best_of.integrations import libio_integration
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
 
+# Metadata of the latest version of all packages in a channel
+CONDA_CHANNELDATA_URL = "https://conda.anaconda.org/{channel}/channeldata.json"
+CONDA_CHANNELDATA_FIELDS = ["version", "summary", "timestamp", "license", "home"]
+# Channels with fewer tracked packages are cheaper to resolve via the package api
+CONDA_CHANNELDATA_MIN_PACKAGES = 3
+
+
+class JsonStreamParser:
+    """Incrementally parses a JSON object that is fed in chunks.
+
+    The members in `STREAMED_MEMBERS` are arrays or objects that are decoded one entry
+    at a time via `handle_entry`, so that they are never materialized as a whole.
+    All other members are decoded as a whole and passed to `handle_member`.
+    """
+
+    STREAMED_MEMBERS: set = set()
+
+    # Whitespace and separators between keys, values, and array items
+    SEPARATOR_PATTERN = re.compile(r"[\s,]*")
+    # Characters that terminate a number
+    NUMBER_DELIMITER_PATTERN = re.compile(r"[\s,}\]]")
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._state = "start"
+        self._key = ""
+        self._entry_key: Optional[str] = None
+        self._closing_char = ""
+
+    @property
+    def is_finished(self) -> bool:
+        return self._state == "finished"
+
+    def handle_member(self, key: str, value: Any) -> None:
+        pass
+
+    def handle_entry(self, member: str, key: Optional[str], value: Any) -> None:
+        pass
+
+    def feed(self, text: str, final: bool = False) -> None:
+        self._buffer = self._buffer[self._position :] + text
+        self._position = 0
+        while not self.is_finished and self._parse_next(final):
+            pass
+
+        if final and not self.is_finished:
+            raise ValueError("The JSON object is incomplete.")
+
+    def _decode_value(self, final: bool) -> Tuple[bool, Any]:
+        """Decodes the next value and returns whether it is complete."""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._position)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+        if (
+            not final
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and not self.NUMBER_DELIMITER_PATTERN.match(self._buffer, end)
+        ):
+            # Numbers might continue in the next chunk (e.g. `1.` or `12e`)
+            return False, None
+        self._position = end
+        return True, value
+
+    def _consume(self, expected_char: str, char: str, next_state: str) -> None:
+        if char != expected_char:
+            raise ValueError(
+                "Invalid JSON near " + self._key + ": expected " + expected_char
+            )
+        self._position += 1
+        self._state = next_state
+
+    def _parse_next(self, final: bool) -> bool:
+        """Parses the next token and returns `False` if more text is required."""
+        separator = self.SEPARATOR_PATTERN.match(self._buffer, self._position)
+        # The pattern also matches an empty separator, the assert narrows the type
+        assert separator is not None
+        self._position = separator.end()
+        if self._position >= len(self._buffer):
+            return False
+        char = self._buffer[self._position]
+
+        if self._state == "start":
+            self._consume("{", char, "key")
+        elif self._state == "key":
+            if char == "}":
+                self._consume("}", char, "finished")
+                return True
+            is_complete, key = self._decode_value(final)
+            if not is_complete:
+                return False
+            self._key = key
+            self._state = "colon"
+        elif self._state == "colon":
+            self._consume(":", char, "value")
+        elif self._state == "value":
+            if self._key in self.STREAMED_MEMBERS and char in "[{":
+                self._closing_char = "]" if char == "[" else "}"
+                self._consume(char, char, "entry")
+                return True
+            is_complete, value = self._decode_value(final)
+            if not is_complete:
+                return False
+            self.handle_member(self._key, value)
+            self._state = "key"
+        elif self._state == "entry":
+            if char == self._closing_char:
+                self._consume(char, char, "key")
+                return True
+            if self._closing_char == "]":
+                # Array entries have no key
+                self._state = "entry_value"
+                return True
+            is_complete, entry_key = self._decode_value(final)
+            if not is_complete:
+                return False
+            self._entry_key = entry_key
+            self._state = "entry_colon"
+        elif self._state == "entry_colon":
+            self._consume(":", char, "entry_value")
+        elif self._state == "entry_value":
+            is_complete, value = self._decode_value(final)
+            if not is_complete:
+                return False
+            self.handle_entry(self._key, self._entry_key, value)
+            self._entry_key = None
+            self._state = "entry"
+        return True
+
+
+class CondaPackageParser(JsonStreamParser):
+    """Incrementally parses the package info of the anaconda api.
+
+    Only the top-level fields in `FIELDS` are kept, and the files are decoded one
+    at a time to sum up their downloads, so that the (potentially huge) file list
+    is never materialized.
+    """
+
+    FIELDS = {"created_at", "modified_at", "summary", "versions"}
+    STREAMED_MEMBERS = {"files"}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.package_info = Dict()
+        self.total_downloads = 0
+
+    def handle_member(self, key: str, value: Any) -> None:
+        if key in self.FIELDS:
+            self.package_info[key] = value
+
+    def handle_entry(self, member: str, key: Optional[str], value: Any) -> None:
+        if isinstance(value, dict) and value.get("ndownloads"):
+            self.total_downloads += int(value["ndownloads"])
+
+
+class ChanneldataParser(JsonStreamParser):
+    """Incrementally parses the `channeldata.json` of a conda channel.
+
+    Only the fields in `CONDA_CHANNELDATA_FIELDS` of the requested packages are kept.
+    """
+
+    STREAMED_MEMBERS = {"packages"}
+
+    def __init__(self, packages: Iterable[str]) -> None:
+        super().__init__()
+        self.requested_packages = set(packages)
+        self.packages: dict = {}
+
+    def handle_entry(self, member: str, key: Optional[str], value: Any) -> None:
+        if key not in self.requested_packages or not isinstance(value, dict):
+            return
+        self.packages[key] = Dict(
+            {
+                field: value[field]
+                for field in CONDA_CHANNELDATA_FIELDS
+                if value.get(field)
+            }
+        )
+
+
+def feed_chunks(parser: JsonStreamParser, chunks: Iterable[bytes]) -> None:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b"", final=True), final=True)
+
+
+def parse_conda_package(text: str) -> Dict:
+    parser = CondaPackageParser()
+    parser.feed(text, final=True)
+    parser.package_info.total_downloads = parser.total_downloads
+    return parser.package_info
+
+
+def read_conda_package(chunks: Iterable[bytes]) -> Dict:
+    """Reads the package info of the anaconda api without keeping the file list."""
+    parser = CondaPackageParser()
+    feed_chunks(parser, chunks)
+    parser.package_info.total_downloads = parser.total_downloads
+    return parser.package_info
+
+
+def read_file_chunks(path: str, chunk_size: int = 64 * 1024) -> Iterable[bytes]:
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def split_conda_id(conda_id: str) -> Tuple[str, str]:
+    """Returns the channel and the package name, the default channel is anaconda."""
+    if "/" in conda_id:
+        channel, package = conda_id.split("/", 1)
+        return channel, package
+    return "anaconda", conda_id
+
+
+_channeldata_activated = False
+_channeldata_files: dict = {}
+_channeldata: dict = {}
+_channeldata_lock = threading.Lock()
+
+
+def configure(
+    channeldata: bool = False, channeldata_files: Optional[dict] = None
+) -> None:
+    """Configures the resolution of the package metadata via the channeldata of the channels.
+
+    Args:
+        channeldata (bool, optional): If `True`, the `channeldata.json` of every channel is loaded once.
+        channeldata_files (dict, optional): Local copies of the `channeldata.json` per channel.
+    """
+    global _channeldata_activated
+    with _channeldata_lock:
+        _channeldata_activated = channeldata
+        _channeldata_files.clear()
+        _channeldata_files.update(channeldata_files or {})
+        _channeldata.clear()
+
+
+def load_channeldata(channel: str, packages: Iterable[str]) -> Optional[dict]:
+    """Streams the `channeldata.json` of the channel from the local copy or the channel.
+
+    Returns:
+        The metadata of the requested packages or `None` if the channeldata is not available.
+    """
+    parser = ChanneldataParser(packages)
+    try:
+        if channel in _channeldata_files:
+            feed_chunks(parser, read_file_chunks(_channeldata_files[channel]))
+            return parser.packages
+
+        # The channeldata of large channels is too big for the response cache
+        response = http_client.stream(CONDA_CHANNELDATA_URL.format(channel=channel))
+        try:
+            if response.status_code != 200:
+                log.info(
+                    "Unable to request channeldata of conda channel: "
+                    + channel
+                    + " ("
+                    + str(response.status_code)
+                    + ")"
+                )
+                return None
+            feed_chunks(parser, http_client.iter_chunks(response))
+        finally:
+            response.close()
+        return parser.packages
+    except Exception as ex:
+        log.info("Failed to load channeldata of conda channel: " + channel, exc_info=ex)
+        return None
+
+
+def prefetch_channeldata(projects_info: List[Dict]) -> None:
+    """Loads the channeldata of all channels and indexes the packages of the projects.
+
+    Every channel is loaded only once, and only the metadata of the requested
+    packages is kept. Channels with only a few tracked packages are skipped
+    unless a local copy is configured.
+    """
+    if not _channeldata_activated:
+        return
+
+    channel_packages: dict = {}
+    for project_info in projects_info:
+        if project_info.get("conda_id"):
+            channel, package = split_conda_id(project_info["conda_id"])
+            channel_packages.setdefault(channel, set()).add(package)
+
+    for channel, packages in channel_packages.items():
+        if (
+            channel not in _channeldata_files
+            and len(packages) < CONDA_CHANNELDATA_MIN_PACKAGES
+        ):
+            continue
+
+        channeldata = load_channeldata(channel, packages)
+        if channeldata is None:
+            continue
+
+        with _channeldata_lock:
+            for package, package_info in channeldata.items():
+                _channeldata[(channel, package)] = package_info
+
+
+def get_channeldata_package(conda_id: str) -> Optional[Dict]:
+    with _channeldata_lock:
+        return _channeldata.get(split_conda_id(conda_id))
+
 
 class CondaIntegration(BaseIntegration):
     @property
     def name(self) -> str:
         return "conda"
 
+    @property
+    def hosts(self) -> List[str]:
+        return ["libraries.io", "api.anaconda.org"]
+
     def update_project_info(self, project_info: Dict) -> None:
         if not project_info.conda_id:
             return
@@ -36,7 +360,13 @@ class CondaIntegration(BaseIntegration):
             # libraries.io can currently only parse conda packages from default channel (anaconda)
             libio_integration.update_package_via_libio("conda", project_info)
 
-        self.update_via_conda_api(project_info)
+        channel_package = get_channeldata_package(project_info.conda_id)
+        if channel_package:
+            self.update_via_channeldata(project_info, channel_package)
+            # Downloads, creation date, and release count are only available via the api
+            self.update_via_conda_api(project_info, with_channeldata=True)
+        else:
+            self.update_via_conda_api(project_info)
 
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         conda_id = project.conda_id
@@ -98,25 +428,78 @@ class CondaIntegration(BaseIntegration):
             conda_channel=conda_channel, conda_package=conda_package
         )
 
-    def update_via_conda_api(self, project_info: Dict) -> None:
+    def update_via_channeldata(self, project_info: Dict, channel_package: Dict) -> None:
+        updated_at = None
+        if channel_package.timestamp:
+            try:
+                timestamp = float(channel_package.timestamp)
+                if timestamp > 1e11:
+                    # Newer packages use timestamps in milliseconds
+                    timestamp = timestamp / 1000
+                updated_at = datetime.utcfromtimestamp(timestamp)
+                project_info.conda_latest_release_published_at = updated_at
+                if not project_info.updated_at or project_info.updated_at < updated_at:
+                    project_info.updated_at = updated_at
+            except Exception as ex:
+                log.warning(
+                    "Failed to parse timestamp: " + str(channel_package.timestamp),
+                    exc_info=ex,
+                )
+
+        if (
+            channel_package.version
+            and updated_at
+            and not project_info.latest_stable_release_number
+        ):
+            project_info.latest_stable_release_number = str(channel_package.version)
+            project_info.latest_stable_release_published_at = updated_at
+
+        if not project_info.license and channel_package.license:
+            project_info.license = channel_package.license
+
+        if not project_info.homepage and channel_package.home:
+            project_info.homepage = channel_package.home
+
+        if (
+            not project_info.description
+            or len(project_info.description) < MIN_PROJECT_DESC_LENGTH
+        ) and channel_package.summary:
+            project_info.description = channel_package.summary
+
+    def update_via_conda_api(
+        self, project_info: Dict, with_channeldata: bool = False
+    ) -> None:
+        """Updates the project via the package info of the anaconda api.
+
+        Args:
+            project_info (Dict): Collected project metadata.
+            with_channeldata (bool, optional): If `True`, the summary and the latest
+                release date are not used, since they are resolved via the channeldata.
+                The downloads, creation date, and release count are still used.
+        """
         try:
             conda_package = project_info.conda_id
             if "/" not in conda_package:
                 # Add anaconda as default channel, if channel not provided
                 conda_package = "anaconda/" + project_info.conda_id
 
-            request = requests.get("https://api.anaconda.org/package/" + conda_package)
-            request.text
-            if request.status_code != 200:
-                log.info(
-                    "Unable to find package via conda api: "
-                    + project_info.conda_id
-                    + " ("
-                    + str(request.status_code)
-                    + ")"
-                )
-                return
-            conda_info = Dict(request.json())
+            # The package info contains all files and can be very large
+            response = http_client.stream(
+                "https://api.anaconda.org/package/" + conda_package
+            )
+            try:
+                if response.status_code != 200:
+                    log.info(
+                        "Unable to find package via conda api: "
+                        + project_info.conda_id
+                        + " ("
+                        + str(response.status_code)
+                        + ")"
+                    )
+                    return
+                conda_info = read_conda_package(http_client.iter_chunks(response))
+            finally:
+                response.close()
 
             created_at = None
             if conda_info.created_at:
@@ -133,7 +516,7 @@ class CondaIntegration(BaseIntegration):
                         exc_info=ex,
                     )
 
-            if conda_info.modified_at:
+            if conda_info.modified_at and not with_channeldata:
                 try:
                     updated_at = parse(str(conda_info.modified_at), ignoretz=True)
                     # Set as latest release publish date
@@ -150,11 +533,7 @@ class CondaIntegration(BaseIntegration):
                         exc_info=ex,
                     )
 
-            total_downloads = 0
-            if conda_info.files:
-                for package_file in conda_info.files:
-                    total_downloads += int(package_file.ndownloads)
-
+            total_downloads = conda_info.total_downloads
             if total_downloads:
                 project_info.conda_total_downloads = total_downloads
 
@@ -182,9 +561,13 @@ class CondaIntegration(BaseIntegration):
             # TODO: set licenses if provided
 
             if (
-                not project_info.description
-                or len(project_info.description) < MIN_PROJECT_DESC_LENGTH
-            ) and conda_info.summary:
+                not with_channeldata
+                and (
+                    not project_info.description
+                    or len(project_info.description) < MIN_PROJECT_DESC_LENGTH
+                )
+                and conda_info.summary
+            ):
                 project_info.description = conda_info.summary
 
         except Exception as ex:
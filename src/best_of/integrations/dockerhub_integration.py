@@ -1,21 +1,121 @@
 import logging
+import math
+import threading
 from datetime import datetime
+from typing import List, Optional
 
-import requests
 from addict import Dict
 from dateutil.parser import parse
 
-from best_of import utils
+from best_of import http_client, utils
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
 
+# Namespaces with more tracked images are requested via the paged namespace listing
+DOCKERHUB_NAMESPACE_THRESHOLD = 2
+DOCKERHUB_PAGE_SIZE = 100
+
+
+def get_repository_id(dockerhub_id: str) -> str:
+    if "/" not in dockerhub_id:
+        # if official image, it needs a library/ appended to the id to be requested via url
+        return "library/" + dockerhub_id
+    return dockerhub_id
+
+
+def request_namespace_repositories(namespace: str, image_count: int) -> List[Dict]:
+    """Requests the info of the images of the namespace via the paged listing.
+
+    The listing is only paged through if it needs fewer requests than requesting the
+    `image_count` tracked images on their own. Otherwise, only the images of the first
+    page are returned.
+
+    Returns:
+        The info of the listed images or an empty list if the request failed.
+    """
+    repositories: List[Dict] = []
+    url: Optional[str] = (
+        "https://hub.docker.com/v2/repositories/"
+        + namespace
+        + "/?page_size="
+        + str(DOCKERHUB_PAGE_SIZE)
+    )
+    try:
+        while url:
+            response = http_client.get(url)
+            if response.status_code != 200:
+                log.info(
+                    "Unable to list images of namespace via dockerhub api: "
+                    + namespace
+                    + " ("
+                    + str(response.status_code)
+                    + ")"
+                )
+                break
+            page = Dict(response.json())
+            if not repositories and page.next:
+                # Only page through the listing if it needs fewer requests
+                page_count = math.ceil(int(page["count"] or 0) / DOCKERHUB_PAGE_SIZE)
+                if page_count >= image_count:
+                    url = None
+                else:
+                    url = page.next
+            else:
+                url = page.next or None
+            repositories.extend(page.results or [])
+    except Exception as ex:
+        log.info(
+            "Failed to list images of namespace via dockerhub api: " + namespace,
+            exc_info=ex,
+        )
+    return repositories
+
+
+_prefetched_images: dict = {}
+_prefetched_images_lock = threading.Lock()
+
+
+def prefetch_namespace_images(projects_info: List[Dict]) -> None:
+    """Requests the images of namespaces with many tracked images via the namespace listing.
+
+    The image info is used by the next update of the project instead of requesting
+    the image on its own. Images that are missing in the listing are requested
+    individually as before.
+    """
+    namespace_images: dict = {}
+    for project_info in projects_info:
+        if project_info.get("dockerhub_id"):
+            namespace, image = get_repository_id(project_info["dockerhub_id"]).split(
+                "/", 1
+            )
+            namespace_images.setdefault(namespace, set()).add(image)
+
+    for namespace, images in namespace_images.items():
+        if len(images) <= DOCKERHUB_NAMESPACE_THRESHOLD:
+            continue
+
+        repositories = request_namespace_repositories(namespace, len(images))
+        with _prefetched_images_lock:
+            for repository in repositories:
+                if repository.name in images:
+                    _prefetched_images[namespace + "/" + repository.name] = repository
+
+
+def pop_prefetched_image(repository_id: str) -> Optional[Dict]:
+    with _prefetched_images_lock:
+        return _prefetched_images.pop(repository_id, None)
+
 
 class DockerhubIntegration(BaseIntegration):
     @property
     def name(self) -> str:
         return "dockerhub"
 
+    @property
+    def hosts(self) -> List[str]:
+        return ["hub.docker.com"]
+
     def update_project_info(self, project_info: Dict) -> None:
         if not project_info.dockerhub_id:
             return
@@ -28,32 +128,13 @@ class DockerhubIntegration(BaseIntegration):
 
             project_info.dockerhub_url = "https://hub.docker.com/r/" + dockerhub_url_id
 
-        try:
-            dockerhub_url_id = project_info.dockerhub_id
-            if "/" not in dockerhub_url_id:
-                # if official image, it needs a library/ appended to the id to be requested via url
-                dockerhub_url_id = "library/" + dockerhub_url_id
-
-            request = requests.get(
-                "https://hub.docker.com/v2/repositories/" + dockerhub_url_id
-            )
-            if request.status_code != 200:
-                log.info(
-                    "Unable to find image via dockerhub api: "
-                    + project_info.dockerhub_id
-                    + " ("
-                    + str(request.status_code)
-                    + ")"
-                )
+        dockerhub_info = pop_prefetched_image(
+            get_repository_id(project_info.dockerhub_id)
+        )
+        if not dockerhub_info:
+            dockerhub_info = self.request_dockerhub_info(project_info)
+            if not dockerhub_info:
                 return
-            dockerhub_info = Dict(request.json())
-        except Exception as ex:
-            log.info(
-                "Failed to request docker image via dockerhub api: "
-                + project_info.dockerhub_id,
-                exc_info=ex,
-            )
-            return
 
         if not dockerhub_info.name:
             # Check if name exist -> if not, request most likely failed
@@ -107,6 +188,30 @@ class DockerhubIntegration(BaseIntegration):
         ) and dockerhub_info.description:
             project_info.description = dockerhub_info.description
 
+    def request_dockerhub_info(self, project_info: Dict) -> Optional[Dict]:
+        try:
+            request = http_client.get(
+                "https://hub.docker.com/v2/repositories/"
+                + get_repository_id(project_info.dockerhub_id)
+            )
+            if request.status_code != 200:
+                log.info(
+                    "Unable to find image via dockerhub api: "
+                    + project_info.dockerhub_id
+                    + " ("
+                    + str(request.status_code)
+                    + ")"
+                )
+                return None
+            return Dict(request.json())
+        except Exception as ex:
+            log.info(
+                "Failed to request docker image via dockerhub api: "
+                + project_info.dockerhub_id,
+                exc_info=ex,
+            )
+            return None
+
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         dockerhub_id = project.dockerhub_id
         if not dockerhub_id:
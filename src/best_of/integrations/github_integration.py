@@ -1,54 +1,491 @@
+import asyncio
+import codecs
 import logging
+import math
 import os
 import re
+import threading
 import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import AsyncIterable, Iterable, List, Optional, Tuple
 
-import requests
+import httpx
 from addict import Dict
-from bs4 import BeautifulSoup
 from dateutil.parser import parse
+from tqdm import tqdm
 
-from best_of import default_config, utils
+from best_of import caching, default_config, http_client, throttling, utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
 from best_of.integrations import libio_integration
+from best_of.throttling import HostConcurrencyLimiter
 
 log = logging.getLogger(__name__)
 
 
-def get_repo_deps_via_github(github_id: str) -> int:
+GITHUB_GRAPHQL_API = "https://api.github.com/graphql"
+
+# TODO: parse github dependents: https://github.com/badgen/badgen.net/blob/master/endpoints/github.ts#L406
+# TODO: Github assets download: https://github.com/badgen/badgen.net/blob/master/endpoints/github.ts#L125
+# TODO: latest stable release, PR...
+# discussions {
+#   totalCount
+# }
+# isArchived
+# isDisabled
+# isEmpty
+# isFork
+# isInOrganization
+# isSecurityPolicyEnabled
+# hasIssuesEnabled
+
+# GraphQL query
+# https://github.com/badgen/badgen.net/blob/master/endpoints/github.ts#L214
+GITHUB_REPOSITORY_FRAGMENT = """
+fragment RepositoryMetadata on Repository {
+  id
+  name
+  nameWithOwner
+  description
+  url
+  homepageUrl
+  createdAt
+  updatedAt
+  pushedAt
+  diskUsage
+  primaryLanguage {
+    name
+  }
+  licenseInfo {
+    spdxId
+  }
+  stargazers {
+    totalCount
+  }
+  pullRequests {
+    totalCount
+  }
+  forks {
+    totalCount
+  }
+  watchers {
+    totalCount
+  }
+  masterCommit: defaultBranchRef {
+      target {
+        ... on Commit {
+          committedDate
+          recent_activity: history(since: $since_recent_activity) {
+              totalCount
+          }
+          history {
+              totalCount
+          }
+        }
+      }
+  }
+  repositoryTopics(first: 100) {
+    nodes {
+      topic {
+        name
+      }
+    }
+  }
+  openIssues: issues(states: OPEN) {
+    totalCount
+  }
+  closedIssues: issues(states: CLOSED) {
+    totalCount
+  }
+  releases(first: 100, orderBy: {field:CREATED_AT, direction:DESC}) {
+    totalCount
+    nodes {
+      id
+      createdAt
+      publishedAt
+      tagName
+      isDraft
+      isPrerelease
+      releaseAssets(first: 100) {
+        nodes {
+          downloadCount
+        }
+      }
+    }
+  }
+}
+"""
+
+GITHUB_METADATA_QUERY = """
+query($owner: String!, $repo: String!, $since_recent_activity: GitTimestamp!) {
+  repository(owner: $owner, name: $repo) {
+    ...RepositoryMetadata
+  }
+  rateLimit {
+    cost
+    remaining
+    resetAt
+  }
+}
+"""
+
+# Requests a repository by its node ID, which is stable across renames
+GITHUB_NODE_METADATA_QUERY = """
+query($id: ID!, $since_recent_activity: GitTimestamp!) {
+  node(id: $id) {
+    ...RepositoryMetadata
+  }
+  rateLimit {
+    cost
+    remaining
+    resetAt
+  }
+}
+"""
+
+# With the release ledger, only the most recent releases are requested on every run
+GITHUB_RECENT_RELEASES = 10
+GITHUB_LEDGER_REPOSITORY_FRAGMENT = GITHUB_REPOSITORY_FRAGMENT.replace(
+    "releases(first: 100,", "releases(first: " + str(GITHUB_RECENT_RELEASES) + ","
+)
+# Points per hour of a single token, used until the quota of a token is known
+GITHUB_TOKEN_QUOTA = 5000
+
+# Number of threads that refresh stale dependents and contributors in the background
+GITHUB_STATS_REFRESH_WORKERS = 2
+# Maximum number of stale dependents and contributors that are refreshed per run
+GITHUB_STATS_MAX_REFRESHES = 50
+# Share of the stats ttl by which the expiry of every repo is moved forward,
+# so that the cached stats do not all expire within the same run
+GITHUB_STATS_TTL_JITTER = 0.25
+
+# Time in seconds until the release ledger is rebuilt to refresh the downloads of old releases
+GITHUB_RELEASE_LEDGER_MAX_AGE = 30 * 24 * 60 * 60
+
+# Pages through all releases that were created after the cursor
+GITHUB_RELEASES_QUERY = """
+query($owner: String!, $repo: String!, $cursor: String) {
+  repository(owner: $owner, name: $repo) {
+    releases(first: 100, after: $cursor, orderBy: {field:CREATED_AT, direction:ASC}) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        id
+        createdAt
+        publishedAt
+        tagName
+        isDraft
+        isPrerelease
+        releaseAssets(first: 100) {
+          nodes {
+            downloadCount
+          }
+        }
+      }
+    }
+  }
+  rateLimit {
+    cost
+    remaining
+    resetAt
+  }
+}
+"""
+
+# Lightweight query to detect whether a repository changed since the last run
+GITHUB_PROBE_FRAGMENT = """
+fragment RepositoryProbe on Repository {
+  pushedAt
+  stargazers {
+    totalCount
+  }
+  releases(first: 1, orderBy: {field: CREATED_AT, direction: DESC}) {
+    nodes {
+      createdAt
+    }
+  }
+}
+"""
+GITHUB_PROBE_BATCH_SIZE = 100
+
+# Aliased repositories per batched metadata query. Every repository can request up to
+# 100 releases with 100 assets each, so the upper limit keeps a query below the limit
+# of 500,000 nodes per query.
+GITHUB_BATCH_INITIAL_SIZE = 10
+GITHUB_BATCH_MAX_SIZE = 40
+# Rate limit points that a batched metadata query should cost
+GITHUB_BATCH_TARGET_COST = 50
+
+
+class GitHubTokenPool:
+    """Rotates multiple GitHub tokens by their remaining quota.
+
+    The quota is tracked per token and rate limit resource (e.g. `graphql` or `core`)
+    based on the responses of the GitHub API. Every request uses the token with the
+    highest remaining quota, so that the requests are spread across all tokens.
+
+    Args:
+        tokens (list): GitHub API tokens.
+    """
+
+    def __init__(self, tokens: List[str]):
+        self.tokens = list(dict.fromkeys(token for token in tokens if token))
+        self._quotas: dict = {}
+        self._lock = threading.Lock()
+
+    def _get_remaining(self, token: str, resource: str) -> float:
+        quota = self._quotas.get((token, resource))
+        if quota is None or time.time() >= quota[1]:
+            # Unknown or already reset
+            return GITHUB_TOKEN_QUOTA
+        return quota[0]
+
+    def get_token(self, resource: str = "graphql") -> Optional[str]:
+        """Returns the token with the highest remaining quota for the resource."""
+        with self._lock:
+            if not self.tokens:
+                return None
+            return max(
+                self.tokens, key=lambda token: self._get_remaining(token, resource)
+            )
+
+    def update(
+        self, token: str, resource: str, remaining: float, reset_at: float
+    ) -> None:
+        with self._lock:
+            self._quotas[(token, resource)] = (remaining, reset_at)
+
+    def get_total_quota(self, resource: str = "graphql") -> Tuple[float, float]:
+        """Returns the remaining quota of all tokens and the time of the latest reset."""
+        with self._lock:
+            remaining = sum(
+                self._get_remaining(token, resource) for token in self.tokens
+            )
+            reset_times = [
+                reset_at
+                for (token, quota_resource), (_, reset_at) in self._quotas.items()
+                if quota_resource == resource and reset_at > time.time()
+            ]
+            return remaining, max(reset_times, default=time.time() + 60 * 60)
+
+
+def load_github_tokens() -> List[str]:
+    """Loads the GitHub tokens from `GITHUB_API_KEY` (comma-separated) and `GITHUB_API_KEY_FILE`."""
+    tokens = os.getenv("GITHUB_API_KEY", "").split(",")
+
+    token_file = os.getenv("GITHUB_API_KEY_FILE")
+    if token_file:
+        try:
+            with open(token_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip().startswith("#"):
+                        tokens.append(line)
+        except OSError as ex:
+            log.warning("Failed to read GitHub token file: " + token_file, exc_info=ex)
+
+    return [token.strip() for token in tokens if token.strip()]
+
+
+_token_pool: Optional[GitHubTokenPool] = None
+_token_pool_source: Optional[tuple] = None
+_token_pool_lock = threading.Lock()
+
+
+def get_token_pool() -> GitHubTokenPool:
+    """Returns the pool of the GitHub tokens that are configured via environment variables."""
+    global _token_pool, _token_pool_source
+    source = (os.getenv("GITHUB_API_KEY"), os.getenv("GITHUB_API_KEY_FILE"))
+    with _token_pool_lock:
+        if _token_pool is None or source != _token_pool_source:
+            _token_pool = GitHubTokenPool(load_github_tokens())
+            _token_pool_source = source
+        return _token_pool
+
+
+def get_github_token(resource: str = "graphql") -> Optional[str]:
+    return get_token_pool().get_token(resource)
+
+
+def update_token_quota(github_api_token: str, response: http_client.Response) -> None:
+    """Updates the quota of the token with the rate limit headers of the response."""
+    if http_client.is_cached(response):
+        return
+
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset_at = response.headers.get("X-RateLimit-Reset")
+    if remaining is None or reset_at is None:
+        return
+
     try:
-        request = requests.get(
+        get_token_pool().update(
+            github_api_token,
+            response.headers.get("X-RateLimit-Resource", "core"),
+            float(remaining),
+            float(reset_at),
+        )
+    except ValueError:
+        log.debug("Failed to parse GitHub rate limit headers.")
+
+
+class RepoDepsParser:
+    """Incrementally extracts the number of dependents from the GitHub dependents page.
+
+    The page is fed in chunks and only the counters of the repositories and packages
+    tabs are matched, so that reading can stop as soon as both counters are found.
+    """
+
+    # Text that is kept between chunks to match counters split across chunks
+    MAX_TAIL_LENGTH = 256
+    # The packages tab directly follows the repositories tab
+    PACKAGES_SEARCH_LENGTH = 16 * 1024
+
+    REPOSITORIES_PATTERN = re.compile(r"([0-9,]+)\s+Repositories")
+    PACKAGES_PATTERN = re.compile(r"([0-9,]+)\s+Packages")
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._searched_for_packages = 0
+        self.repository_count: Optional[int] = None
+        self.package_count: Optional[int] = None
+
+    @property
+    def is_finished(self) -> bool:
+        if self.repository_count is None:
+            return False
+        return (
+            self.package_count is not None
+            or self._searched_for_packages > self.PACKAGES_SEARCH_LENGTH
+        )
+
+    @property
+    def dependent_count(self) -> int:
+        return (self.repository_count or 0) + (self.package_count or 0)
+
+    def feed(self, text: str) -> None:
+        self._buffer += text
+
+        if self.repository_count is None:
+            match = self.REPOSITORIES_PATTERN.search(self._buffer)
+            if not match:
+                self._buffer = self._buffer[-self.MAX_TAIL_LENGTH :]
+                return
+            self.repository_count = int(match.group(1).replace(",", ""))
+            self._buffer = self._buffer[match.end() :]
+
+        if self.package_count is None:
+            match = self.PACKAGES_PATTERN.search(self._buffer)
+            if match:
+                self.package_count = int(match.group(1).replace(",", ""))
+            self._searched_for_packages += len(text)
+            self._buffer = self._buffer[-self.MAX_TAIL_LENGTH :]
+
+
+def parse_repo_deps(html: str) -> int:
+    parser = RepoDepsParser()
+    parser.feed(html)
+    return parser.dependent_count
+
+
+def read_repo_deps(chunks: Iterable[bytes]) -> int:
+    """Reads the dependents page until the counters are found."""
+    parser = RepoDepsParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        if parser.is_finished:
+            break
+    return parser.dependent_count
+
+
+async def read_repo_deps_async(chunks: AsyncIterable[bytes]) -> int:
+    parser = RepoDepsParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    async for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        if parser.is_finished:
+            break
+    return parser.dependent_count
+
+
+def log_repo_deps_failure(github_id: str, response: http_client.Response) -> None:
+    log.info(
+        "Unable to find repo dependents via GitHub api: "
+        + github_id
+        + " ("
+        + str(response.status_code)
+        + ")"
+    )
+
+
+def get_repo_deps_via_github(github_id: str) -> Optional[int]:
+    try:
+        response = http_client.stream(
             "https://github.com/" + github_id + "/network/dependents"
         )
-        if request.status_code != 200:
-            log.info(
-                "Unable to find repo dependents via GitHub api: "
-                + github_id
-                + " ("
-                + str(request.status_code)
-                + ")"
+        try:
+            if response.status_code != 200:
+                log_repo_deps_failure(github_id, response)
+                return None
+            # Closing the response stops the download after the counters
+            return read_repo_deps(http_client.iter_chunks(response))
+        finally:
+            response.close()
+    except Exception as ex:
+        log.info(
+            "Unable to find repo dependents via GitHub api: " + github_id, exc_info=ex
+        )
+        return None
+
+
+async def get_repo_deps_via_github_async(
+    github_id: str, client: httpx.AsyncClient, limiter: HostConcurrencyLimiter
+) -> Optional[int]:
+    try:
+        async with limiter.limit("github.com"):
+            response = await http_client.stream_async(
+                client, "https://github.com/" + github_id + "/network/dependents"
             )
-            return 0
-        repo_deps = 0
-        soup = BeautifulSoup(request.text, "html.parser")
-        repo_deps_str = soup.find(string=re.compile(r"[0-9,]+\s+Repositories"))
-        if repo_deps_str:
-            count_search = re.search("([0-9,]+)", repo_deps_str, re.IGNORECASE)
-            if count_search:
-                repo_deps += int(count_search.group(1).replace(",", ""))
-        pkg_deps_str = soup.find(string=re.compile(r"[0-9,]+\s+Packages"))
-        if pkg_deps_str:
-            count_search = re.search("([0-9,]+)", pkg_deps_str, re.IGNORECASE)
-            if count_search:
-                repo_deps += int(count_search.group(1).replace(",", ""))
-        return repo_deps
+            try:
+                if response.status_code != 200:
+                    log_repo_deps_failure(github_id, response)
+                    return None
+                return await read_repo_deps_async(response.aiter_bytes())
+            finally:
+                await response.aclose()
     except Exception as ex:
         log.info(
             "Unable to find repo dependents via GitHub api: " + github_id, exc_info=ex
         )
-        return 0
+        return None
+
+
+def parse_contributor_count(link_header: str) -> int:
+    contributor_count = 0
+    for found_group in re.findall(r"\?page=([0-9]+)", link_header, re.IGNORECASE):
+        contributor_count = max(contributor_count, int(found_group))
+    return contributor_count
+
+
+def process_contributors_response(
+    github_id: str, response: http_client.Response
+) -> Optional[int]:
+    if response.status_code != 200:
+        log.info(
+            "Unable to find repo contributors via GitHub api: "
+            + github_id
+            + " ("
+            + str(response.status_code)
+            + ")"
+        )
+        return None
+
+    if "Link" not in response.headers or not response.headers["Link"]:
+        return None
+
+    return parse_contributor_count(response.headers["Link"])
 
 
 def get_contributors_via_github_api(
@@ -58,31 +495,44 @@ def get_contributors_via_github_api(
         return None
 
     try:
-        request = requests.get(
+        request = http_client.get(
             "https://api.github.com/repos/"
             + github_id
             + "/contributors?page=1&per_page=1&anon=True",
             headers={"Authorization": "token " + github_api_token},
         )
-        if request.status_code != 200:
-            log.info(
-                "Unable to find repo contributors via GitHub api: "
-                + github_id
-                + " ("
-                + str(request.status_code)
-                + ")"
-            )
-            return None
+        update_token_quota(github_api_token, request)
+        return process_contributors_response(github_id, request)
+    except Exception as ex:
+        log.info(
+            "Unable to find repo dependents via GitHub api: " + github_id,
+            exc_info=ex,
+        )
 
-        if "Link" not in request.headers or not request.headers["Link"]:
-            return None
+        return None
 
-        link_header = request.headers["Link"]
 
-        contributor_count = 0
-        for found_group in re.findall(r"\?page=([0-9]+)", link_header, re.IGNORECASE):
-            contributor_count = max(contributor_count, int(found_group))
-        return contributor_count
+async def get_contributors_via_github_api_async(
+    github_id: str,
+    github_api_token: str,
+    client: httpx.AsyncClient,
+    limiter: HostConcurrencyLimiter,
+) -> Optional[int]:
+    if not github_id or not github_api_token:
+        return None
+
+    try:
+        async with limiter.limit("api.github.com"):
+            request = await http_client.request_async(
+                client,
+                "GET",
+                "https://api.github.com/repos/"
+                + github_id
+                + "/contributors?page=1&per_page=1&anon=True",
+                headers={"Authorization": "token " + github_api_token},
+            )
+        update_token_quota(github_api_token, request)
+        return process_contributors_response(github_id, request)
     except Exception as ex:
         log.info(
             "Unable to find repo dependents via GitHub api: " + github_id,
@@ -92,132 +542,355 @@ def get_contributors_via_github_api(
         return None
 
 
-def request_metadata_from_github_api(
-    github_api_token: str, github_id: str, recent_activity_date: datetime
-) -> Optional[Dict]:
+# Dependents and contributors change slowly, so they are cached for a longer time
+_stats_ttl: float = default_config.GITHUB_STATS_TTL
+_stats_refresh_executor: Optional[ThreadPoolExecutor] = None
+_stats_refresh_futures: List[Future] = []
+_stats_refresh_lock = threading.Lock()
 
-    owner = github_id.split("/")[0]
-    repo = github_id.split("/")[1]
-
-    # TODO: parse github dependents: https://github.com/badgen/badgen.net/blob/master/endpoints/github.ts#L406
-    # TODO: Github assets download: https://github.com/badgen/badgen.net/blob/master/endpoints/github.ts#L125
-    # TODO: latest stable release, PR...
-    # discussions {
-    #   totalCount
-    # }
-    # isArchived
-    # isDisabled
-    # isEmpty
-    # isFork
-    # isInOrganization
-    # isSecurityPolicyEnabled
-    # hasIssuesEnabled
-
-    # GraphQL query
-    # https://github.com/badgen/badgen.net/blob/master/endpoints/github.ts#L214
-    query = """
-query($owner: String!, $repo: String!, $since_recent_activity: GitTimestamp!) {
-  repository(owner: $owner, name: $repo) {
-    name
-    nameWithOwner
-    description
-    url
-    homepageUrl
-    createdAt
-    updatedAt
-    pushedAt
-    diskUsage
-    primaryLanguage {
-      name
-    }
-    licenseInfo {
-      spdxId
-    }
-    stargazers {
-      totalCount
-    }
-    pullRequests {
-      totalCount
-    }
-    forks {
-      totalCount
-    }
-    watchers {
-      totalCount
-    }
-    masterCommit: defaultBranchRef {
-        target {
-          ... on Commit {
-            committedDate
-            recent_activity: history(since: $since_recent_activity) {
-                totalCount
-            }
-            history {
-                totalCount
-            }
-          }
-        }
-    }
-    repositoryTopics(first: 100) {
-      nodes {
-        topic {
-          name
-        }
-      }
-    }
-    openIssues: issues(states: OPEN) {
-      totalCount
-    }
-    closedIssues: issues(states: CLOSED) {
-      totalCount
+
+def configure(stats_ttl: float = default_config.GITHUB_STATS_TTL) -> None:
+    """Sets the time in seconds until cached dependents and contributors are refreshed."""
+    global _stats_ttl
+    _stats_ttl = stats_ttl
+
+
+def store_github_stats(
+    github_id: str,
+    dependent_project_count: Optional[int],
+    contributor_count: Optional[int],
+) -> dict:
+    stats = {
+        "dependent_project_count": dependent_project_count,
+        "contributor_count": contributor_count,
     }
-    releases(first: 100, orderBy: {field:CREATED_AT, direction:DESC}) {
-      nodes {
-        createdAt
-        publishedAt
-        tagName
-        isDraft
-        isPrerelease
-        releaseAssets(first: 100) {
-          nodes {
-            downloadCount
-          }
+    cache = caching.get_cache("github-stats")
+    # Failed or partial results are not cached, so that they are requested again with the next run
+    if (
+        cache is not None
+        and dependent_project_count is not None
+        and contributor_count is not None
+    ):
+        cache.set(github_id, stats)
+    return stats
+
+
+def get_github_stats_ttl(github_id: str) -> float:
+    """Returns the stats ttl of the repo, which is shortened by a stable per-repo jitter."""
+    jitter = (zlib.crc32(github_id.lower().encode("utf-8")) % 1000) / 1000
+    return _stats_ttl * (1 - GITHUB_STATS_TTL_JITTER * jitter)
+
+
+def get_cached_github_stats(github_id: str) -> Optional[Tuple[dict, bool]]:
+    """Returns the cached dependents and contributors and whether they are still fresh."""
+    cache = caching.get_cache("github-stats")
+    if cache is None:
+        return None
+    entry = cache.get(github_id)
+    if entry is None:
+        return None
+    stats, stored_at = entry
+    return stats, time.time() - stored_at <= get_github_stats_ttl(github_id)
+
+
+def request_github_stats(github_id: str, github_api_token: str) -> dict:
+    return store_github_stats(
+        github_id,
+        get_repo_deps_via_github(github_id),
+        get_contributors_via_github_api(github_id, github_api_token),
+    )
+
+
+async def request_github_stats_async(
+    github_id: str,
+    github_api_token: str,
+    client: httpx.AsyncClient,
+    limiter: HostConcurrencyLimiter,
+) -> dict:
+    # Dependents and contributors are requested from different hosts
+    dependent_project_count, contributor_count = await asyncio.gather(
+        get_repo_deps_via_github_async(github_id, client, limiter),
+        get_contributors_via_github_api_async(
+            github_id, github_api_token, client, limiter
+        ),
+    )
+    return store_github_stats(github_id, dependent_project_count, contributor_count)
+
+
+def schedule_github_stats_refresh(github_id: str, github_api_token: str) -> None:
+    """Refreshes the cached dependents and contributors in the background.
+
+    The stale values are used for the current run, the refreshed values by the next run.
+    At most `GITHUB_STATS_MAX_REFRESHES` repos are refreshed per run, the others are
+    refreshed by one of the following runs.
+    """
+    global _stats_refresh_executor
+    with _stats_refresh_lock:
+        if len(_stats_refresh_futures) >= GITHUB_STATS_MAX_REFRESHES:
+            return
+        if _stats_refresh_executor is None:
+            _stats_refresh_executor = ThreadPoolExecutor(
+                max_workers=GITHUB_STATS_REFRESH_WORKERS
+            )
+        _stats_refresh_futures.append(
+            _stats_refresh_executor.submit(
+                request_github_stats, github_id, github_api_token
+            )
+        )
+
+
+def finish_github_stats_refresh() -> None:
+    """Waits until all scheduled refreshes of dependents and contributors are finished."""
+    global _stats_refresh_executor
+    with _stats_refresh_lock:
+        executor = _stats_refresh_executor
+        futures = list(_stats_refresh_futures)
+        _stats_refresh_executor = None
+        _stats_refresh_futures.clear()
+
+    if executor is None:
+        return
+
+    if futures:
+        log.info(
+            "Waiting for the refresh of dependents and contributors of "
+            + str(len(futures))
+            + " GitHub repos."
+        )
+    wait(futures)
+    executor.shutdown()
+
+
+def update_github_stats(project_info: Dict, stats: dict) -> None:
+    update_dependent_project_count(project_info, stats["dependent_project_count"])
+    update_contributor_count(project_info, stats["contributor_count"])
+
+
+# Paces the GraphQL queries to stay within the hourly budget of points
+_graphql_budget = throttling.RateLimitBudget()
+
+
+def update_graphql_budget(
+    github_api_token: str, response: http_client.Response, rate_limit: Optional[dict]
+) -> None:
+    """Updates the GraphQL budget with the `rateLimit` block of a query response.
+
+    The budget covers the remaining points of all tokens in the pool.
+    """
+    if http_client.is_cached(response):
+        return
+    if not rate_limit or rate_limit.get("remaining") is None:
+        return
+    try:
+        token_pool = get_token_pool()
+        token_pool.update(
+            github_api_token,
+            "graphql",
+            float(rate_limit["remaining"]),
+            parse(rate_limit["resetAt"]).timestamp(),
+        )
+        remaining, reset_at = token_pool.get_total_quota("graphql")
+        _graphql_budget.update(rate_limit.get("cost") or 1, remaining, reset_at)
+    except Exception as ex:
+        log.debug("Failed to parse GraphQL rate limit: " + str(rate_limit), exc_info=ex)
+
+
+def expect_metadata_queries(github_ids: List[str]) -> None:
+    """Announces the number of metadata queries the collection will send, to pace them."""
+    with _prefetched_metadata_lock:
+        pending = [
+            github_id
+            for github_id in github_ids
+            if github_id and "/" in github_id and github_id not in _prefetched_metadata
+        ]
+    _graphql_budget.set_pending(len(pending))
+
+
+def is_release_ledger_activated() -> bool:
+    return caching.is_activated()
+
+
+def get_repository_fragment() -> str:
+    if is_release_ledger_activated():
+        return GITHUB_LEDGER_REPOSITORY_FRAGMENT
+    return GITHUB_REPOSITORY_FRAGMENT
+
+
+def get_metadata_query() -> str:
+    return GITHUB_METADATA_QUERY + get_repository_fragment()
+
+
+def get_github_identity(github_id: str) -> Optional[dict]:
+    """Returns the canonical name and node ID of a repository from a previous run."""
+    cache = caching.get_cache("github-identities")
+    if cache is None or not github_id:
+        return None
+    entry = cache.get(github_id.lower())
+    return entry[0] if entry else None
+
+
+def get_github_node_id(github_id: str) -> Optional[str]:
+    identity = get_github_identity(github_id)
+    return identity["node_id"] if identity else None
+
+
+def resolve_github_id(github_id: str) -> str:
+    """Returns the current `owner/name` of a repository that might have been renamed."""
+    identity = get_github_identity(github_id)
+    return identity["name_with_owner"] if identity else github_id
+
+
+def store_github_identity(github_id: str, github_info: Dict) -> None:
+    """Persists the canonical name and node ID of the configured repository."""
+    cache = caching.get_cache("github-identities")
+    if cache is None or not github_info.id or not github_info.nameWithOwner:
+        return
+    cache.set(
+        github_id.lower(),
+        {"name_with_owner": github_info.nameWithOwner, "node_id": github_info.id},
+    )
+
+
+def forget_github_identity(github_id: str) -> None:
+    cache = caching.get_cache("github-identities")
+    if cache is not None:
+        cache.delete(github_id.lower())
+
+
+def get_metadata_request(github_id: str, recent_activity_date: datetime) -> dict:
+    """Returns the query of a single repository, by node ID if it is known."""
+    node_id = get_github_node_id(github_id)
+    if node_id:
+        return {
+            "query": GITHUB_NODE_METADATA_QUERY + get_repository_fragment(),
+            "variables": {
+                "id": node_id,
+                "since_recent_activity": recent_activity_date.isoformat(),
+            },
         }
-      }
+    return {
+        "query": get_metadata_query(),
+        "variables": get_metadata_query_variables(github_id, recent_activity_date),
     }
-  }
-}
-"""
-    headers = {"Authorization": "token " + github_api_token}
-    variables = {
-        "owner": owner,
-        "repo": repo,
+
+
+def get_recent_activity_date() -> datetime:
+    # Check activity since the latest 90 days.
+    # Starts at midnight, so that the query stays the same (and cacheable) for a day.
+    return (
+        datetime.now() - timedelta(days=default_config.RECENT_ACTIVITY_DAYS)
+    ).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def get_metadata_query_variables(
+    github_id: str, recent_activity_date: datetime
+) -> dict:
+    return {
+        "owner": github_id.split("/")[0],
+        "repo": github_id.split("/")[1],
         "since_recent_activity": recent_activity_date.isoformat(),
     }
 
-    try:
-        response = requests.post(
-            "https://api.github.com/graphql",
-            json={"query": query, "variables": variables},
-            headers=headers,
+
+def process_metadata_response(
+    github_api_token: str, github_id: str, response: http_client.Response
+) -> Optional[Dict]:
+    update_token_quota(github_api_token, response)
+    if response.status_code != 200:
+        log.info(
+            "Unable to find GitHub repo via GitHub api: "
+            + github_id
+            + " ("
+            + str(response.status_code)
+            + ")"
         )
+        return None
+    response_data = response.json()
 
-        if response.status_code != 200:
-            log.info(
-                "Unable to find GitHub repo via GitHub api: "
-                + github_id
-                + " ("
-                + str(response.status_code)
-                + ")"
+    if "data" not in response_data:
+        log.info("Request returned unexpected data: " + str(response_data))
+        return None
+
+    update_graphql_budget(
+        github_api_token, response, response_data["data"].get("rateLimit")
+    )
+    github_info = Dict(
+        response_data["data"].get("repository") or response_data["data"].get("node")
+    )
+    if not github_info:
+        log.info("Unable to find GitHub repo via GitHub api: " + github_id)
+        # The repository might be deleted or recreated, it is requested by name again
+        forget_github_identity(github_id)
+        return None
+    store_github_identity(github_id, github_info)
+    store_metadata_snapshot(github_id, github_info)
+    return github_info
+
+
+def is_forgotten_node_request(github_id: str, metadata_request: dict) -> bool:
+    """Returns `True` if the repository was not found by its node ID and is requested by name."""
+    return "id" in metadata_request["variables"] and not get_github_node_id(github_id)
+
+
+def request_metadata_from_github_api(
+    github_api_token: str, github_id: str, recent_activity_date: datetime
+) -> Optional[Dict]:
+    headers = {"Authorization": "token " + github_api_token}
+
+    try:
+        while True:
+            metadata_request = get_metadata_request(github_id, recent_activity_date)
+            _graphql_budget.acquire()
+            response = http_client.post(
+                GITHUB_GRAPHQL_API,
+                json=metadata_request,
+                headers=headers,
+                is_cacheable=http_client.is_graphql_response_cacheable,
+            )
+            github_info = process_metadata_response(
+                github_api_token, github_id, response
             )
-            return None
-        response_data = response.json()
+            if github_info is not None or not is_forgotten_node_request(
+                github_id, metadata_request
+            ):
+                return github_info
+    except Exception as ex:
+        log.info(
+            "Failed to request GitHub repo via GitHub api: " + github_id,
+            exc_info=ex,
+        )
+        return None
+
 
-        if "data" not in response_data:
-            log.info("Request returned unexpected data: " + str(response_data))
-            return None
+async def request_metadata_from_github_api_async(
+    github_api_token: str,
+    github_id: str,
+    recent_activity_date: datetime,
+    client: httpx.AsyncClient,
+    limiter: HostConcurrencyLimiter,
+) -> Optional[Dict]:
+    headers = {"Authorization": "token " + github_api_token}
 
-        return Dict(response_data["data"]["repository"])
+    try:
+        while True:
+            metadata_request = get_metadata_request(github_id, recent_activity_date)
+            await _graphql_budget.acquire_async()
+            async with limiter.limit("api.github.com"):
+                response = await http_client.request_async(
+                    client,
+                    "POST",
+                    GITHUB_GRAPHQL_API,
+                    json=metadata_request,
+                    headers=headers,
+                    is_cacheable=http_client.is_graphql_response_cacheable,
+                )
+            github_info = process_metadata_response(
+                github_api_token, github_id, response
+            )
+            if github_info is not None or not is_forgotten_node_request(
+                github_id, metadata_request
+            ):
+                return github_info
     except Exception as ex:
         log.info(
             "Failed to request GitHub repo via GitHub api: " + github_id,
@@ -226,36 +899,434 @@ query($owner: String!, $repo: String!, $since_recent_activity: GitTimestamp!) {
         return None
 
 
-def update_via_github_api(project_info: Dict) -> None:
-    if not project_info.github_id:
-        return
+def get_batch_query(
+    batch_size: int,
+    fragment: str,
+    fragment_name: str,
+    variables: str = "",
+    with_nodes: bool = False,
+) -> str:
+    """Returns a query that requests the fragment for `batch_size` aliased repositories.
+
+    With `with_nodes`, the fragment is also requested for all repositories of the
+    node IDs in the `ids` variable.
+    """
+    repo_variables = ", ".join(
+        "$owner{0}: String!, $repo{0}: String!".format(i) for i in range(batch_size)
+    )
+    repositories = "".join(
+        "  repo{0}: repository(owner: $owner{0}, name: $repo{0}) {{\n"
+        "    ...{1}\n"
+        "  }}\n".format(i, fragment_name)
+        for i in range(batch_size)
+    )
+    if with_nodes:
+        variables += "$ids: [ID!]!, "
+        repositories += "  nodes(ids: $ids) {\n    ..." + fragment_name + "\n  }\n"
+    return (
+        "\nquery("
+        + (variables + repo_variables).strip().rstrip(",")
+        + ") {\n"
+        + repositories
+        + "  rateLimit {\n    cost\n    remaining\n    resetAt\n  }\n}\n"
+        + fragment
+    )
 
-    if "/" not in project_info.github_id:
-        log.info("The GitHub project id is not valid: " + project_info.github_id)
+
+def get_batch_metadata_query(batch_size: int, with_nodes: bool = False) -> str:
+    return get_batch_query(
+        batch_size,
+        get_repository_fragment(),
+        "RepositoryMetadata",
+        variables="$since_recent_activity: GitTimestamp!, ",
+        with_nodes=with_nodes,
+    )
+
+
+def get_batch_query_variables(
+    github_ids: List[str], node_ids: Optional[List[str]] = None
+) -> dict:
+    variables: dict = {}
+    for i, github_id in enumerate(github_ids):
+        variables["owner" + str(i)] = github_id.split("/")[0]
+        variables["repo" + str(i)] = github_id.split("/")[1]
+    if node_ids:
+        variables["ids"] = node_ids
+    return variables
+
+
+def split_by_node_id(github_ids: List[str]) -> Tuple[List[str], List[str], List[str]]:
+    """Splits the repositories by whether their node ID is known from a previous run.
+
+    Returns:
+        The repositories without node ID, the repositories with node ID, and their node IDs.
+    """
+    named_github_ids = []
+    node_github_ids = []
+    node_ids = []
+    for github_id in github_ids:
+        node_id = get_github_node_id(github_id)
+        if node_id:
+            node_github_ids.append(github_id)
+            node_ids.append(node_id)
+        else:
+            named_github_ids.append(github_id)
+    return named_github_ids, node_github_ids, node_ids
+
+
+def get_next_batch_size(batch_size: int, cost: Optional[int]) -> int:
+    """Sizes the next batch so that it costs about `GITHUB_BATCH_TARGET_COST` points."""
+    if not cost or batch_size <= 0:
+        return batch_size
+    cost_per_repo = float(cost) / batch_size
+    return max(
+        1, min(GITHUB_BATCH_MAX_SIZE, int(GITHUB_BATCH_TARGET_COST / cost_per_repo))
+    )
+
+
+def request_batch_from_github_api(
+    github_api_token: str,
+    github_ids: List[str],
+    query: str,
+    variables: dict,
+    node_github_ids: Optional[List[str]] = None,
+    use_cache: bool = True,
+) -> Tuple[dict, Optional[int]]:
+    """Requests a batched query of multiple aliased repositories.
+
+    The results of `nodes` are mapped in order to the repositories in `node_github_ids`.
+    Queries that must reflect the current state, e.g. probes, are sent with
+    `use_cache=False`.
+
+    Returns:
+        The result for every repository that was found and the reported cost of the query.
+    """
+    headers = {"Authorization": "token " + github_api_token}
+
+    try:
+        _graphql_budget.acquire()
+        response = http_client.post(
+            GITHUB_GRAPHQL_API,
+            json={"query": query, "variables": variables},
+            headers=headers,
+            use_cache=use_cache,
+            is_cacheable=http_client.is_graphql_response_cacheable,
+        )
+    except Exception as ex:
+        log.info(
+            "Failed to request batch of GitHub repos via GitHub api: "
+            + ", ".join(github_ids),
+            exc_info=ex,
+        )
+        return {}, None
+
+    update_token_quota(github_api_token, response)
+    if response.status_code != 200:
+        log.info(
+            "Unable to request batch of GitHub repos via GitHub api ("
+            + str(response.status_code)
+            + ")"
+        )
+        return {}, None
+
+    response_data = Dict(response.json())
+    update_graphql_budget(github_api_token, response, response_data.data.rateLimit)
+    # Repos that are not found are null, the others are still returned
+    results = {}
+    for i, github_id in enumerate(github_ids):
+        github_info = response_data.data["repo" + str(i)]
+        if github_info:
+            results[github_id] = github_info
+    for github_id, github_info in zip(
+        node_github_ids or [], response_data.data.nodes or []
+    ):
+        if github_info:
+            results[github_id] = github_info
+    return results, response_data.data.rateLimit.cost or None
+
+
+def request_metadata_batch_from_github_api(
+    github_api_token: str, github_ids: List[str], recent_activity_date: datetime
+) -> Tuple[dict, Optional[int]]:
+    """Requests the metadata of multiple repositories within a single query."""
+    named_github_ids, node_github_ids, node_ids = split_by_node_id(github_ids)
+    variables = get_batch_query_variables(named_github_ids, node_ids)
+    variables["since_recent_activity"] = recent_activity_date.isoformat()
+    metadata, cost = request_batch_from_github_api(
+        github_api_token,
+        named_github_ids,
+        get_batch_metadata_query(len(named_github_ids), with_nodes=bool(node_ids)),
+        variables,
+        node_github_ids,
+    )
+    for github_id, github_info in metadata.items():
+        store_github_identity(github_id, github_info)
+        store_metadata_snapshot(github_id, github_info)
+    return metadata, cost
+
+
+_prefetched_metadata: dict = {}
+_prefetched_metadata_lock = threading.Lock()
+
+
+def prefetch_metadata_from_github_api(github_ids: List[str]) -> None:
+    """Requests the metadata of all repositories via batched queries.
+
+    The metadata is used by the next update of the project instead of requesting the
+    repository on its own. Repositories that are missing in a batch response are
+    requested individually as before.
+    """
+    if not get_github_token():
         return
 
-    github_api_token = os.getenv("GITHUB_API_KEY")
-    if not github_api_token:
-        return None
+    with _prefetched_metadata_lock:
+        github_ids = [
+            github_id
+            for github_id in dict.fromkeys(github_ids)
+            if github_id and "/" in github_id and github_id not in _prefetched_metadata
+        ]
+    recent_activity_date = get_recent_activity_date()
+
+    batch_size = GITHUB_BATCH_INITIAL_SIZE
+    position = 0
+    with tqdm(total=len(github_ids), desc="GitHub batches") as progress:
+        while position < len(github_ids):
+            github_api_token = get_github_token()
+            if not github_api_token:
+                break
+            batch = github_ids[position : position + batch_size]
+            _graphql_budget.set_pending(
+                math.ceil((len(github_ids) - position) / batch_size)
+            )
+            metadata, cost = request_metadata_batch_from_github_api(
+                github_api_token, batch, recent_activity_date
+            )
+            with _prefetched_metadata_lock:
+                _prefetched_metadata.update(metadata)
+            position += len(batch)
+            progress.update(len(batch))
+            if not metadata and batch_size > 1:
+                # Large queries might time out, so continue with smaller batches
+                batch_size = max(1, batch_size // 2)
+            else:
+                batch_size = get_next_batch_size(len(batch), cost)
+
+
+def pop_prefetched_metadata(github_id: str) -> Optional[Dict]:
+    with _prefetched_metadata_lock:
+        return _prefetched_metadata.pop(github_id, None)
+
+
+def get_probe_values(github_info: Dict) -> dict:
+    """Returns the values that indicate a change of the repository.
+
+    Works with the results of the probe as well as of the full metadata query.
+    """
+    latest_release_date = None
+    if github_info.releases.nodes:
+        latest_release_date = github_info.releases.nodes[0].createdAt
+    return {
+        "pushed_at": github_info.pushedAt or None,
+        "star_count": github_info.stargazers.totalCount or 0,
+        "latest_release_date": latest_release_date,
+    }
+
 
-    # Check activity since the latest 90 days
-    recent_activity_date = datetime.now() - timedelta(
-        days=default_config.RECENT_ACTIVITY_DAYS
+def store_metadata_snapshot(github_id: str, github_info: Dict) -> None:
+    """Persists the metadata of the repository to reuse it while it is unchanged."""
+    cache = caching.get_cache("github-metadata")
+    if cache is None:
+        return
+    cache.set(
+        github_id,
+        {"probe": get_probe_values(github_info), "metadata": github_info.to_dict()},
     )
 
-    github_info = request_metadata_from_github_api(
-        github_api_token, project_info.github_id, recent_activity_date
+
+def probe_metadata_changes(github_ids: List[str], max_age: float) -> None:
+    """Reuses the cached metadata of all repositories that are unchanged since the last run.
+
+    A lightweight batched probe requests the push date, the star count, and the latest
+    release date of every repository with a metadata snapshot. If these values match
+    the snapshot, the snapshot is used instead of requesting the full metadata query.
+    Snapshots older than `max_age` seconds are always requested again.
+    """
+    cache = caching.get_cache("github-metadata")
+    if cache is None:
+        return
+
+    if not get_github_token():
+        return
+
+    snapshots = {}
+    for github_id in dict.fromkeys(github_ids):
+        if not github_id or "/" not in github_id:
+            continue
+        snapshot = cache.get_fresh(github_id, max_age)
+        if snapshot:
+            snapshots[github_id] = snapshot
+
+    candidates = list(snapshots)
+    unchanged_count = 0
+    for position in range(0, len(candidates), GITHUB_PROBE_BATCH_SIZE):
+        github_api_token = get_github_token()
+        if not github_api_token:
+            break
+        batch = candidates[position : position + GITHUB_PROBE_BATCH_SIZE]
+        _graphql_budget.set_pending(
+            math.ceil((len(candidates) - position) / GITHUB_PROBE_BATCH_SIZE)
+        )
+        named_github_ids, node_github_ids, node_ids = split_by_node_id(batch)
+        probes, _ = request_batch_from_github_api(
+            github_api_token,
+            named_github_ids,
+            get_batch_query(
+                len(named_github_ids),
+                GITHUB_PROBE_FRAGMENT,
+                "RepositoryProbe",
+                with_nodes=bool(node_ids),
+            ),
+            get_batch_query_variables(named_github_ids, node_ids),
+            node_github_ids,
+            # Cached probes would always match the stored snapshots
+            use_cache=False,
+        )
+        for github_id, probe in probes.items():
+            if get_probe_values(probe) != snapshots[github_id]["probe"]:
+                continue
+            with _prefetched_metadata_lock:
+                _prefetched_metadata[github_id] = Dict(snapshots[github_id]["metadata"])
+            unchanged_count += 1
+
+    log.info(
+        str(unchanged_count)
+        + " of "
+        + str(len(candidates))
+        + " probed GitHub repos are unchanged since the last run."
     )
-    if github_info is None:
-        log.info("Retrying failed github api call short wait time.")
-        time.sleep(150)
-        github_info = request_metadata_from_github_api(
-            github_api_token, project_info.github_id, recent_activity_date
+
+
+def get_ledger_release(release: Dict) -> dict:
+    """Returns the release in the shape of the metadata query with the summed downloads."""
+    download_count = 0
+    if release.releaseAssets and release.releaseAssets.nodes:
+        for release_artifact in release.releaseAssets.nodes:
+            if release_artifact.downloadCount:
+                download_count += int(release_artifact.downloadCount)
+    return {
+        "id": release.id,
+        "createdAt": release.createdAt,
+        "publishedAt": release.publishedAt,
+        "tagName": release.tagName,
+        "isDraft": release.isDraft,
+        "isPrerelease": release.isPrerelease,
+        "releaseAssets": {"nodes": [{"downloadCount": download_count}]},
+    }
+
+
+def request_releases_from_github_api(
+    github_api_token: str, github_id: str, cursor: Optional[str]
+) -> Optional[Dict]:
+    """Requests a page of releases created after the cursor (oldest first)."""
+    headers = {"Authorization": "token " + github_api_token}
+    variables = {
+        "owner": github_id.split("/")[0],
+        "repo": github_id.split("/")[1],
+        "cursor": cursor,
+    }
+
+    try:
+        _graphql_budget.acquire()
+        response = http_client.post(
+            GITHUB_GRAPHQL_API,
+            json={"query": GITHUB_RELEASES_QUERY, "variables": variables},
+            headers=headers,
+            is_cacheable=http_client.is_graphql_response_cacheable,
         )
+    except Exception as ex:
+        log.info(
+            "Failed to request GitHub releases via GitHub api: " + github_id,
+            exc_info=ex,
+        )
+        return None
 
-    if github_info is None:
+    update_token_quota(github_api_token, response)
+    if response.status_code != 200:
+        log.info(
+            "Unable to request GitHub releases via GitHub api: "
+            + github_id
+            + " ("
+            + str(response.status_code)
+            + ")"
+        )
+        return None
+
+    response_data = Dict(response.json())
+    update_graphql_budget(github_api_token, response, response_data.data.rateLimit)
+    if not response_data.data.repository:
+        return None
+    return response_data.data.repository.releases
+
+
+def update_release_ledger(
+    github_api_token: str, github_id: str, github_info: Dict
+) -> None:
+    """Completes the releases of the metadata with the persisted release ledger.
+
+    The ledger stores every release of the repository with its summed asset downloads.
+    The metadata query only contains the most recent releases, which are merged into the
+    ledger to refresh their downloads. Only if there are more new releases than covered
+    by the metadata, the releases created after the last seen cursor are requested.
+    The ledger is rebuilt after `GITHUB_RELEASE_LEDGER_MAX_AGE` to refresh the
+    downloads of older releases.
+    """
+    cache = caching.get_cache("github-releases")
+    if cache is None or not github_info.releases:
         return
 
+    cached_entry = cache.get(github_id)
+    ledger = cached_entry[0] if cached_entry else None
+    if not ledger or time.time() - ledger["rebuilt_at"] > GITHUB_RELEASE_LEDGER_MAX_AGE:
+        ledger = {"rebuilt_at": time.time(), "cursor": None, "releases": {}}
+
+    recent_releases = github_info.releases.nodes or []
+    release_count = int(github_info.releases.totalCount or 0)
+    if (
+        release_count > len(recent_releases)
+        and len(ledger["releases"]) < release_count
+        and not any(release.id in ledger["releases"] for release in recent_releases)
+    ):
+        # Some releases between the ledger and the recent releases are missing
+        while True:
+            releases = request_releases_from_github_api(
+                github_api_token, github_id, ledger["cursor"]
+            )
+            if releases is None:
+                # Do not persist an incomplete ledger
+                return
+            for release in releases.nodes or []:
+                ledger["releases"][release.id] = get_ledger_release(release)
+            if releases.pageInfo.endCursor:
+                ledger["cursor"] = releases.pageInfo.endCursor
+            if not releases.pageInfo.hasNextPage:
+                break
+
+    for release in recent_releases:
+        ledger["releases"][release.id] = get_ledger_release(release)
+
+    cache.set(github_id, ledger)
+
+    github_info.releases.nodes = [
+        Dict(release)
+        for release in sorted(
+            ledger["releases"].values(),
+            key=lambda release: release["createdAt"] or "",
+            reverse=True,
+        )
+    ]
+
+
+def update_project_via_github_metadata(project_info: Dict, github_info: Dict) -> None:
     if not project_info.github_url and github_info.url:
         project_info.github_url = github_info.url
 
@@ -458,8 +1529,10 @@ def update_via_github_api(project_info: Dict) -> None:
     ) and github_info.description:
         project_info.description = github_info.description
 
-    # Get dependents count
-    dependent_project_count = get_repo_deps_via_github(project_info.github_id)
+
+def update_dependent_project_count(
+    project_info: Dict, dependent_project_count: int
+) -> None:
     if dependent_project_count:
         if not project_info.dependent_project_count:
             project_info.dependent_project_count = 0
@@ -468,10 +1541,8 @@ def update_via_github_api(project_info: Dict) -> None:
         project_info.dependent_project_count += dependent_project_count
         project_info.github_dependent_project_count = dependent_project_count
 
-    # Get contributor count via GitHub api 3
-    contributor_count = get_contributors_via_github_api(
-        project_info.github_id, github_api_token
-    )
+
+def update_contributor_count(project_info: Dict, contributor_count: int) -> None:
     if contributor_count:
         if not project_info.contributor_count:
             project_info.contributor_count = contributor_count
@@ -479,9 +1550,92 @@ def update_via_github_api(project_info: Dict) -> None:
             # always use the highest number
             project_info.contributor_count = contributor_count
 
+
+def update_via_github_api(project_info: Dict) -> None:
+    if not project_info.github_id:
+        return
+
+    if "/" not in project_info.github_id:
+        log.info("The GitHub project id is not valid: " + project_info.github_id)
+        return
+
+    github_api_token = get_github_token()
+    if not github_api_token:
+        return None
+
+    github_info = pop_prefetched_metadata(project_info.github_id)
+    if github_info is None:
+        github_info = request_metadata_from_github_api(
+            github_api_token, project_info.github_id, get_recent_activity_date()
+        )
+    if github_info is None:
+        return
+
+    update_release_ledger(github_api_token, project_info.github_id, github_info)
+    update_project_via_github_metadata(project_info, github_info)
+
+    # Get dependents count and contributor count via GitHub api 3
+    cached_stats = get_cached_github_stats(project_info.github_id)
+    if cached_stats is None:
+        stats = request_github_stats(project_info.github_id, github_api_token)
+    else:
+        stats, is_fresh = cached_stats
+        if not is_fresh:
+            schedule_github_stats_refresh(project_info.github_id, github_api_token)
+    update_github_stats(project_info, stats)
+
     # TODO: Get monthly statistics: https://github.com/ethereum/go-ethereum/pulse/monthly
 
 
+async def update_via_github_api_async(
+    project_info: Dict, client: httpx.AsyncClient, limiter: HostConcurrencyLimiter
+) -> None:
+    if not project_info.github_id:
+        return
+
+    if "/" not in project_info.github_id:
+        log.info("The GitHub project id is not valid: " + project_info.github_id)
+        return
+
+    github_api_token = get_github_token()
+    if not github_api_token:
+        return None
+
+    github_info = pop_prefetched_metadata(project_info.github_id)
+    if github_info is None:
+        github_info = await request_metadata_from_github_api_async(
+            github_api_token,
+            project_info.github_id,
+            get_recent_activity_date(),
+            client,
+            limiter,
+        )
+    if github_info is None:
+        return
+
+    if is_release_ledger_activated():
+        async with limiter.limit("api.github.com"):
+            await asyncio.get_event_loop().run_in_executor(
+                None,
+                update_release_ledger,
+                github_api_token,
+                project_info.github_id,
+                github_info,
+            )
+    update_project_via_github_metadata(project_info, github_info)
+
+    cached_stats = get_cached_github_stats(project_info.github_id)
+    if cached_stats is None:
+        stats = await request_github_stats_async(
+            project_info.github_id, github_api_token, client, limiter
+        )
+    else:
+        stats, is_fresh = cached_stats
+        if not is_fresh:
+            schedule_github_stats_refresh(project_info.github_id, github_api_token)
+    update_github_stats(project_info, stats)
+
+
 def update_via_github(project_info: Dict) -> None:
     if not project_info.github_id:
         return
@@ -495,6 +1649,25 @@ def update_via_github(project_info: Dict) -> None:
         libio_integration.update_repo_via_libio(project_info)
 
 
+async def update_via_github_async(
+    project_info: Dict, client: httpx.AsyncClient, limiter: HostConcurrencyLimiter
+) -> None:
+    if not project_info.github_id:
+        return
+
+    await update_via_github_api_async(project_info, client, limiter)
+
+    if libio_integration.is_activated() and (
+        not project_info.github_url
+        or (project_info.star_count and project_info.star_count > 20)
+    ):
+        # small projects cannot be found on liberies.io often
+        async with limiter.limit("libraries.io"):
+            await asyncio.get_event_loop().run_in_executor(
+                None, libio_integration.update_repo_via_libio, project_info
+            )
+
+
 def generate_github_details(project: Dict, configuration: Dict) -> str:
     github_id = project.github_id
     if not github_id:
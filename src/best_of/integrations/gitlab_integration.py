@@ -1,11 +1,10 @@
 import logging
-from typing import Tuple
+from typing import List, Tuple
 
-import requests
 from addict import Dict
 from dateutil.parser import parse
 
-from best_of import utils
+from best_of import http_client, utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
 from best_of.integrations.base_integration import BaseIntegration
 
@@ -57,6 +56,10 @@ class GitLabIntegration(BaseIntegration):
     def name(self) -> str:
         return "gitlab"
 
+    @property
+    def hosts(self) -> List[str]:
+        return ["gitlab.com"]
+
     def get_api_url(self, gitlab_id: str) -> Tuple[str, str]:
         """If `gitlab_id` is in the format "<API_ENDPOINT>::org/repo", it returns a tuple "<API_ENDPOINT>, org/repo", otherwise it returns "<GITLAB_DEFAULT_API>, org/repo".
 
@@ -89,9 +92,10 @@ class GitLabIntegration(BaseIntegration):
         api_url, project_id = self.get_api_url(project_info.gitlab_id)
         variables = {"fullPath": project_id}
         try:
-            request = requests.post(
+            request = http_client.post(
                 api_url,
                 json={"query": query, "variables": variables},
+                is_cacheable=http_client.is_graphql_response_cacheable,
             )
 
             if request.status_code != 200:
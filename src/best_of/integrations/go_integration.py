@@ -1,4 +1,5 @@
 import logging
+from typing import List
 
 from addict import Dict
 
@@ -14,6 +15,10 @@ class GoIntegration(BaseIntegration):
     def name(self) -> str:
         return "go"
 
+    @property
+    def hosts(self) -> List[str]:
+        return ["libraries.io"]
+
     def update_project_info(self, project_info: Dict) -> None:
         if not project_info.go_id:
             return
@@ -1,10 +1,10 @@
 import logging
+from typing import List
 
-import requests
 from addict import Dict
 from dateutil.parser import parse
 
-from best_of import utils
+from best_of import http_client, utils
 from best_of.default_config import MIN_PROJECT_DESC_LENGTH
 from best_of.integrations.base_integration import BaseIntegration
 
@@ -16,6 +16,10 @@ class GreasyForkIntegration(BaseIntegration):
     def name(self) -> str:
         return "greasy_fork"
 
+    @property
+    def hosts(self) -> List[str]:
+        return ["greasyfork.org"]
+
     def update_project_info(self, project_info: Dict) -> None:
         if not project_info.greasy_fork_id:
             return
@@ -28,7 +32,7 @@ class GreasyForkIntegration(BaseIntegration):
         try:
             params = Dict()
 
-            response = requests.get(
+            response = http_client.get(
                 f"{project_info.greasy_fork_url}.json",
                 params=params,
             )
@@ -1,19 +1,212 @@
 import logging
 import os
+import threading
+from typing import Any, List, Optional
 from urllib.parse import quote, urlparse
 
 from addict import Dict
 from dateutil.parser import parse
+from tqdm import tqdm
 
-from best_of.default_config import ENV_LIBRARIES_API_KEY, MIN_PROJECT_DESC_LENGTH
+from best_of import caching, http_client
+from best_of.default_config import (
+    ENV_LIBRARIES_API_KEY,
+    LIBIO_CACHE_TTL,
+    MIN_PROJECT_DESC_LENGTH,
+)
 
 log = logging.getLogger(__name__)
 
+LIBIO_HOST = "libraries.io"
+LIBIO_API_URL = "https://" + LIBIO_HOST + "/api"
+# Number of packages that are looked up per bulk request
+LIBIO_BULK_MAX_PROJECTS = 100
+# Package managers that are looked up via libraries.io
+LIBIO_PLATFORMS = ["pypi", "npm", "conda", "cargo", "go", "maven"]
+
+
+_cache_ttl: float = LIBIO_CACHE_TTL
+
 
 def is_activated() -> bool:
     return os.getenv(ENV_LIBRARIES_API_KEY) is not None
 
 
+def configure(cache_ttl: float = LIBIO_CACHE_TTL) -> None:
+    """Sets the time in seconds until cached libraries.io metadata is requested again."""
+    global _cache_ttl
+    _cache_ttl = cache_ttl
+
+
+def get_package_key(package_manager: str, package_id: str) -> str:
+    return package_manager + "/" + package_id
+
+
+def get_repo_key(owner: str, repo: str) -> str:
+    # GitHub ids are case insensitive
+    return "github/" + owner.lower() + "/" + repo.lower()
+
+
+def get_cached_info(key: str) -> Optional[Dict]:
+    """Returns the cached libraries.io metadata if it is still fresh."""
+    cache = caching.get_cache("libio")
+    if cache is None:
+        return None
+    info = cache.get_fresh(key, _cache_ttl)
+    if info is None:
+        return None
+    return Dict(info)
+
+
+def store_info(key: str, info: Dict) -> None:
+    cache = caching.get_cache("libio")
+    if cache is not None:
+        cache.set(key, info.to_dict())
+
+
+def request_libio_api(path: str, method: str = "GET", **kwargs: Any) -> Any:
+    """Requests the libraries.io api via the shared session.
+
+    The minute budget of libraries.io is applied by the rate limiter of the
+    shared client, so that all lookups share a single budget.
+
+    Returns:
+        The parsed response or `None` if the requested entity was not found.
+    """
+    response = http_client.request(
+        method,
+        LIBIO_API_URL + path,
+        params={"api_key": os.getenv(ENV_LIBRARIES_API_KEY)},
+        **kwargs,
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()
+
+
+def request_package(package_manager: str, package_id: str) -> Optional[Dict]:
+    key = get_package_key(package_manager, package_id)
+    package_info = get_cached_info(key)
+    if package_info is not None:
+        return package_info
+
+    package_info = request_libio_api(
+        "/" + package_manager + "/" + quote(package_id, safe="")
+    )
+    if not package_info:
+        return None
+    package_info = Dict(package_info)
+    store_info(key, package_info)
+    return package_info
+
+
+def request_repository(owner: str, repo: str) -> Optional[Dict]:
+    key = get_repo_key(owner, repo)
+    github_info = get_cached_info(key)
+    if github_info is not None:
+        return github_info
+
+    github_info = request_libio_api(
+        "/github/" + quote(owner, safe="") + "/" + quote(repo, safe="")
+    )
+    if not github_info:
+        return None
+    github_info = Dict(github_info)
+    store_info(key, github_info)
+    return github_info
+
+
+def request_packages(package_manager: str, package_ids: List[str]) -> Optional[dict]:
+    """Looks up multiple packages of a package manager with a single request.
+
+    Returns:
+        The package info per found package id (lowercase) or `None` if the request failed.
+    """
+    try:
+        packages = request_libio_api(
+            "/check",
+            method="POST",
+            json={
+                "projects": [
+                    {"name": package_id, "platform": package_manager}
+                    for package_id in package_ids
+                ]
+            },
+        )
+    except Exception as ex:
+        log.info(
+            "Unable to request "
+            + package_manager
+            + " packages from libraries.io bulk api.",
+            exc_info=ex,
+        )
+        return None
+
+    packages_info = {}
+    for package_info in packages or []:
+        if package_info and package_info.get("name"):
+            packages_info[package_info["name"].lower()] = Dict(package_info)
+    return packages_info
+
+
+_prefetched_packages: dict = {}
+_prefetched_packages_lock = threading.Lock()
+
+
+def prefetch_packages_via_libio(projects_info: List[Dict]) -> None:
+    """Looks up the packages of all projects via the bulk api of libraries.io.
+
+    The package info is used by the next update of the project instead of looking up
+    the package on its own. Packages that are missing in a bulk response are
+    requested individually as before.
+    """
+    if not is_activated():
+        return
+
+    for package_manager in LIBIO_PLATFORMS:
+        package_ids = []
+        for project_info in projects_info:
+            package_id = project_info.get(package_manager + "_id")
+            if not package_id:
+                continue
+            if package_manager == "conda" and "/" in package_id:
+                # libraries.io can only parse conda packages from the default channel
+                continue
+            if get_cached_info(get_package_key(package_manager, package_id)):
+                # Cached packages do not use the budget of libraries.io
+                continue
+            package_ids.append(package_id)
+
+        package_ids = list(dict.fromkeys(package_ids))
+        if not package_ids:
+            continue
+
+        for position in tqdm(
+            range(0, len(package_ids), LIBIO_BULK_MAX_PROJECTS),
+            desc="libraries.io " + package_manager,
+        ):
+            bulk_package_ids = package_ids[
+                position : position + LIBIO_BULK_MAX_PROJECTS
+            ]
+            packages_info = request_packages(package_manager, bulk_package_ids)
+            if not packages_info:
+                continue
+
+            for package_id in bulk_package_ids:
+                if package_id.lower() not in packages_info:
+                    continue
+                package_info = packages_info[package_id.lower()]
+                store_info(get_package_key(package_manager, package_id), package_info)
+                with _prefetched_packages_lock:
+                    _prefetched_packages[(package_manager, package_id)] = package_info
+
+
+def pop_prefetched_package(package_manager: str, package_id: str) -> Optional[Dict]:
+    with _prefetched_packages_lock:
+        return _prefetched_packages.pop((package_manager, package_id), None)
+
+
 def update_package_via_libio(
     package_manager: str, project_info: Dict, package_info: Dict = None
 ) -> None:
@@ -22,34 +215,32 @@ def update_package_via_libio(
 
     if not package_info:
         package_id = package_manager + "_id"
-        try:
-            from pybraries.search import Search
+        package_info = pop_prefetched_package(package_manager, project_info[package_id])
 
-            search = Search()
-            package_info = search.project(
-                platforms=package_manager, name=quote(project_info[package_id], safe="")
-            )
+        if not package_info:
+            try:
+                package_info = request_package(
+                    package_manager, project_info[package_id]
+                )
 
-            if not package_info:
+                if not package_info:
+                    log.info(
+                        "Unable to find "
+                        + package_manager
+                        + " package: "
+                        + project_info[package_id]
+                    )
+                    return
+            except Exception as ex:
                 log.info(
-                    "Unable to find "
+                    "Unable to request "
                     + package_manager
-                    + " package: "
-                    + project_info[package_id]
+                    + " info from libraries.io: "
+                    + project_info[package_id],
+                    exc_info=ex,
                 )
                 return
 
-            package_info = Dict(package_info)
-        except Exception as ex:
-            log.info(
-                "Unable to request "
-                + package_manager
-                + " info from libraries.io: "
-                + project_info[package_id],
-                exc_info=ex,
-            )
-            return
-
     if not project_info.homepage:
         if package_info.homepage and package_info.homepage.lower() != "unknown":
             project_info.homepage = package_info.homepage
@@ -227,10 +418,7 @@ def update_repo_via_libio(project_info: Dict) -> None:
     repo = project_info.github_id.split("/")[1]
 
     try:
-        from pybraries.search import Search
-
-        search = Search()
-        github_info = search.repository(host="github", owner=owner, repo=repo)
+        github_info = request_repository(owner, repo)
 
         if not github_info:
             log.info(
@@ -239,8 +427,6 @@ def update_repo_via_libio(project_info: Dict) -> None:
                 + ". This might also happen if the repo is quite new, was recently renamed, or has very few stars."
             )
             return
-
-        github_info = Dict(github_info)
     except Exception as ex:
         log.info(
             "Unable to request GitHub repo info from libraries.io: "
@@ -334,3 +520,24 @@ def update_repo_via_libio(project_info: Dict) -> None:
         or len(project_info.description) < MIN_PROJECT_DESC_LENGTH
     ) and github_info.description:
         project_info.description = github_info.description
+
+
+def request_repository_projects(owner: str, repo: str) -> Optional[list]:
+    """Returns the packages of all package managers that are published from the repository."""
+    try:
+        return request_libio_api(
+            "/github/"
+            + quote(owner, safe="")
+            + "/"
+            + quote(repo, safe="")
+            + "/projects"
+        )
+    except Exception as ex:
+        log.info(
+            "Unable to request projects of GitHub repo from libraries.io: "
+            + owner
+            + "/"
+            + repo,
+            exc_info=ex,
+        )
+        return None
@@ -1,4 +1,5 @@
 import logging
+from typing import List
 
 from addict import Dict
 
@@ -14,6 +15,10 @@ class MavenIntegration(BaseIntegration):
     def name(self) -> str:
         return "maven"
 
+    @property
+    def hosts(self) -> List[str]:
+        return ["libraries.io"]
+
     def update_project_info(self, project_info: Dict) -> None:
         if not project_info.maven_id:
             return
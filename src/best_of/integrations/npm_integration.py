@@ -1,25 +1,137 @@
 import logging
+from typing import List, Optional
 from urllib.parse import quote
 
-import requests
 from addict import Dict
 
-from best_of import utils
+from best_of import http_client, utils
 from best_of.integrations import libio_integration
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
 
 
+# The downloads api accepts up to 128 unscoped packages per bulk request
+NPM_BULK_MAX_PACKAGES = 128
+
+
+def update_monthly_downloads(project_info: Dict, monthly_downloads: int) -> None:
+    if monthly_downloads:
+        project_info.npm_monthly_downloads = int(monthly_downloads)
+
+        if not project_info.monthly_downloads:
+            project_info.monthly_downloads = 0
+
+        project_info.monthly_downloads += project_info.npm_monthly_downloads
+
+
+def update_via_npm_api(project_info: Dict) -> None:
+    # Get monthly downloads
+    try:
+        request = http_client.get(
+            "https://api.npmjs.org/downloads/point/last-month/"
+            + quote(project_info.npm_id, safe="")
+        )
+        if request.status_code != 200:
+            log.info(
+                "Unable to find package via npm api: "
+                + project_info.npm_id
+                + " ("
+                + str(request.status_code)
+                + ")"
+            )
+            return
+        npm_download_info = Dict(request.json())
+        update_monthly_downloads(project_info, npm_download_info.downloads)
+    except Exception as ex:
+        log.info(
+            "Failed to request package via npm api: " + project_info.npm_id,
+            exc_info=ex,
+        )
+        return
+
+
+def request_bulk_downloads(npm_ids: List[str]) -> Optional[dict]:
+    """Requests the monthly downloads of multiple unscoped packages with a single request.
+
+    Returns:
+        The monthly downloads per found package or `None` if the request failed.
+    """
+    try:
+        request = http_client.get(
+            "https://api.npmjs.org/downloads/point/last-month/"
+            + ",".join(quote(npm_id, safe="") for npm_id in npm_ids)
+        )
+        if request.status_code != 200:
+            log.info(
+                "Unable to request bulk downloads via npm api ("
+                + str(request.status_code)
+                + ")"
+            )
+            return None
+        # Packages that are not found are null
+        return {
+            npm_id: download_info["downloads"]
+            for npm_id, download_info in request.json().items()
+            if download_info and download_info.get("downloads") is not None
+        }
+    except Exception as ex:
+        log.info(
+            "Failed to request bulk downloads via npm api: " + ", ".join(npm_ids),
+            exc_info=ex,
+        )
+        return None
+
+
+def update_via_npm_bulk_api(projects_info: List[Dict]) -> None:
+    """Requests the monthly downloads of all projects with as few requests as possible.
+
+    Scoped packages are not supported by the bulk endpoint and are requested individually.
+    """
+    unscoped_projects: dict = {}
+    for project_info in projects_info:
+        if project_info.npm_id.startswith("@"):
+            update_via_npm_api(project_info)
+        else:
+            unscoped_projects.setdefault(project_info.npm_id, []).append(project_info)
+
+    npm_ids = list(unscoped_projects)
+    for position in range(0, len(npm_ids), NPM_BULK_MAX_PACKAGES):
+        bulk_npm_ids = npm_ids[position : position + NPM_BULK_MAX_PACKAGES]
+
+        bulk_downloads = None
+        # A single package is returned in a different format
+        if len(bulk_npm_ids) > 1:
+            bulk_downloads = request_bulk_downloads(bulk_npm_ids)
+
+        for npm_id in bulk_npm_ids:
+            for project_info in unscoped_projects[npm_id]:
+                if bulk_downloads is None:
+                    update_via_npm_api(project_info)
+                elif npm_id in bulk_downloads:
+                    update_monthly_downloads(project_info, bulk_downloads[npm_id])
+                else:
+                    log.info("Unable to find package via npm api: " + npm_id)
+
+
 class NpmIntegration(BaseIntegration):
     @property
     def name(self) -> str:
         return "npm"
 
-    def update_project_info(self, project_info: Dict) -> None:
-        if not project_info.npm_id:
-            return
-
+    @property
+    def hosts(self) -> List[str]:
+        return ["libraries.io", "api.npmjs.org"]
+
+    def get_requested_hosts(self, project_info: Dict) -> List[str]:
+        # The downloads are requested in bulk via update_projects_info
+        return [
+            host
+            for host in super().get_requested_hosts(project_info)
+            if host != "api.npmjs.org"
+        ]
+
+    def update_package_info(self, project_info: Dict) -> None:
         if not project_info.npm_url:
             project_info.npm_url = (
                 "https://www.npmjs.com/package/" + project_info.npm_id
@@ -28,41 +140,28 @@ class NpmIntegration(BaseIntegration):
         if libio_integration.is_activated():
             libio_integration.update_package_via_libio("npm", project_info)
 
-        # Get monthly downloads
-        try:
-            request = requests.get(
-                "https://api.npmjs.org/downloads/point/last-month/"
-                + quote(project_info.npm_id, safe="")
-            )
-            request.text
-            if request.status_code != 200:
-                log.info(
-                    "Unable to find package via npm api: "
-                    + project_info.npm_id
-                    + " ("
-                    + str(request.status_code)
-                    + ")"
-                )
-                return
-            npm_download_info = Dict(request.json())
-            if npm_download_info.downloads:
-                project_info.npm_monthly_downloads = int(npm_download_info.downloads)
-
-                if not project_info.monthly_downloads:
-                    project_info.monthly_downloads = 0
-
-                project_info.monthly_downloads += project_info.npm_monthly_downloads
-
-        except Exception as ex:
-            log.info(
-                "Failed to request package via npm api: " + project_info.npm_id,
-                exc_info=ex,
-            )
+    def update_project_info(self, project_info: Dict) -> None:
+        if not project_info.npm_id:
             return
 
+        self.update_package_info(project_info)
+        update_via_npm_api(project_info)
+
         # TODO use npms-api to get additional details:
         # https://api-docs.npms.io/#api-Package-GetMultiPackageInfo
 
+    def prepare_project_info(self, project_info: Dict) -> None:
+        if not project_info.npm_id:
+            return
+
+        self.update_package_info(project_info)
+
+    def update_projects_info(self, projects_info: List[Dict]) -> None:
+        # The package info is already updated via prepare_project_info
+        update_via_npm_bulk_api(
+            [project_info for project_info in projects_info if project_info.npm_id]
+        )
+
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         npm_id = project.npm_id
         if not npm_id:
@@ -1,24 +1,245 @@
-import json
 import logging
-import time
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Tuple
+from urllib.parse import quote
 
-import pypistats
 from addict import Dict
-from httpx import HTTPStatusError
-from requests.exceptions import HTTPError
 
-from best_of import utils
+from best_of import http_client, utils
 from best_of.integrations import libio_integration
 from best_of.integrations.base_integration import BaseIntegration
 
 log = logging.getLogger(__name__)
 
+# Requests are paced by the rate limit of pypistats.org, so few workers are sufficient
+PYPISTATS_QUEUE_WORKERS = 2
+
+
+def request_monthly_downloads(pypi_id: str) -> Optional[int]:
+    """Requests the downloads of the last month from pypistats.
+
+    Returns:
+        The monthly downloads or `None` if the request failed.
+    """
+    # pypi stats limit is 30 per minute: https://github.com/crflynn/pypistats.org/issues/28#issuecomment-598417650
+    # The shared rate limiter and retry policy take care of the limit.
+    try:
+        # get download count from pypi stats
+        response = http_client.get(
+            "https://pypistats.org/api/packages/"
+            + quote(pypi_id.lower(), safe="")
+            + "/recent",
+            params={"period": "month"},
+        )
+        if response.status_code != 200:
+            log.info(
+                f"Unable to request statistics from pypi: {pypi_id} ({response.status_code})"
+            )
+            return None
+
+        # TODO use pepy api as fallback: https://api.pepy.tech/api/projects/lazydocs
+
+        return int(response.json()["data"]["last_month"])
+    except Exception as ex:
+        log.warning(
+            "Unable to request statistics from pypi (unexpected exception): " + pypi_id,
+            exc_info=ex,
+        )
+        return None
+
+
+def update_monthly_downloads(project_info: Dict, monthly_downloads: int) -> None:
+    project_info.pypi_monthly_downloads = int(monthly_downloads)
+
+    if not project_info.monthly_downloads:
+        project_info.monthly_downloads = 0
+
+    project_info.monthly_downloads += int(project_info.pypi_monthly_downloads)
+
+
+# Possible column names of exports from the public PyPI downloads dataset
+PYPI_DUMP_NAME_COLUMNS = ["project", "package", "name", "file.project"]
+PYPI_DUMP_DOWNLOADS_COLUMNS = ["downloads", "num_downloads", "download_count", "count"]
+
+
+def normalize_package_name(name: str) -> str:
+    # https://peps.python.org/pep-0503/#normalized-names
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def load_downloads_dump(downloads_file: str) -> dict:
+    """Loads the monthly downloads of all packages from a CSV or Parquet export.
+
+    The export needs a column with the package name (e.g. `project`) and a column with
+    the downloads of the last month (e.g. `num_downloads`). Multiple rows of the same
+    package are summed up.
+
+    Returns:
+        The monthly downloads per normalized package name.
+    """
+    import pandas as pd
+
+    columns = PYPI_DUMP_NAME_COLUMNS + PYPI_DUMP_DOWNLOADS_COLUMNS
+    if downloads_file.lower().endswith(".parquet"):
+        # Requires pyarrow or fastparquet
+        downloads_df = pd.read_parquet(downloads_file)
+    else:
+        downloads_df = pd.read_csv(
+            downloads_file, usecols=lambda column: column.lower() in columns
+        )
+
+    df_columns = {column.lower(): column for column in downloads_df.columns}
+    name_column = next(
+        (
+            df_columns[column]
+            for column in PYPI_DUMP_NAME_COLUMNS
+            if column in df_columns
+        ),
+        None,
+    )
+    downloads_column = next(
+        (
+            df_columns[column]
+            for column in PYPI_DUMP_DOWNLOADS_COLUMNS
+            if column in df_columns
+        ),
+        None,
+    )
+    if name_column is None or downloads_column is None:
+        raise ValueError(
+            "The PyPI downloads file requires a package name and a downloads column: "
+            + downloads_file
+        )
+
+    package_names = (
+        downloads_df[name_column]
+        .astype(str)
+        .str.replace(r"[-_.]+", "-", regex=True)
+        .str.lower()
+    )
+    monthly_downloads = (
+        pd.to_numeric(downloads_df[downloads_column], errors="coerce")
+        .fillna(0)
+        .groupby(package_names)
+        .sum()
+    )
+    return {
+        package_name: int(downloads)
+        for package_name, downloads in monthly_downloads.items()
+    }
+
+
+_downloads_dump: Optional[dict] = None
+
+
+def configure(downloads_file: Optional[str] = None) -> None:
+    """Loads the monthly downloads from a local export instead of requesting pypistats.
+
+    If `None`, the monthly downloads are requested from pypistats.
+    """
+    global _downloads_dump
+    _downloads_dump = None
+    if not downloads_file:
+        return
+
+    try:
+        _downloads_dump = load_downloads_dump(downloads_file)
+        log.info(
+            "Loaded the monthly downloads of "
+            + str(len(_downloads_dump))
+            + " PyPI packages from "
+            + downloads_file
+        )
+    except Exception as ex:
+        log.warning(
+            "Unable to load the PyPI downloads file, pypistats is used instead: "
+            + downloads_file,
+            exc_info=ex,
+        )
+
+
+_pypistats_executor: Optional[ThreadPoolExecutor] = None
+_pypistats_requests: List[Tuple[Dict, Future]] = []
+_pypistats_lock = threading.Lock()
+
+
+def start_pypistats_queue() -> None:
+    """Sends the pypistats requests of the following project updates via a background queue.
+
+    The project updates do not wait for pypistats, the monthly downloads are added
+    to the projects by `finish_pypistats_queue`.
+    """
+    global _pypistats_executor
+    with _pypistats_lock:
+        if _pypistats_executor is None:
+            _pypistats_executor = ThreadPoolExecutor(
+                max_workers=PYPISTATS_QUEUE_WORKERS
+            )
+
+
+def schedule_pypistats_request(project_info: Dict) -> bool:
+    """Adds the pypistats request of the project to the queue.
+
+    Returns:
+        `False` if the queue is not started.
+    """
+    with _pypistats_lock:
+        if _pypistats_executor is None:
+            return False
+        _pypistats_requests.append(
+            (
+                project_info,
+                _pypistats_executor.submit(
+                    request_monthly_downloads, project_info.pypi_id
+                ),
+            )
+        )
+        return True
+
+
+def finish_pypistats_queue() -> None:
+    """Waits for all queued pypistats requests and adds the monthly downloads to the projects."""
+    global _pypistats_executor
+    with _pypistats_lock:
+        executor = _pypistats_executor
+        requests = list(_pypistats_requests)
+        _pypistats_executor = None
+        _pypistats_requests.clear()
+
+    if executor is None:
+        return
+
+    if requests:
+        log.info(
+            "Waiting for the monthly downloads of "
+            + str(len(requests))
+            + " PyPI packages."
+        )
+    for project_info, future in requests:
+        monthly_downloads = future.result()
+        if monthly_downloads is not None:
+            update_monthly_downloads(project_info, monthly_downloads)
+    executor.shutdown()
+
 
 class PypiIntegration(BaseIntegration):
     @property
     def name(self) -> str:
         return "pypi"
 
+    @property
+    def hosts(self) -> List[str]:
+        return ["libraries.io", "pypistats.org"]
+
+    def get_requested_hosts(self, project_info: Dict) -> List[str]:
+        hosts = super().get_requested_hosts(project_info)
+        if _downloads_dump is not None or _pypistats_executor is not None:
+            # The downloads are loaded from the dump or throttled by the pypistats queue
+            hosts = [host for host in hosts if host != "pypistats.org"]
+        return hosts
+
     def update_project_info(self, project_info: Dict) -> None:
         if not project_info.pypi_id:
             return
@@ -29,7 +250,10 @@ class PypiIntegration(BaseIntegration):
         if libio_integration.is_activated():
             libio_integration.update_package_via_libio("pypi", project_info)
 
-        self.update_via_pypistats(project_info)
+        if _downloads_dump is not None:
+            self.update_via_downloads_dump(project_info)
+        elif not schedule_pypistats_request(project_info):
+            self.update_via_pypistats(project_info)
 
     def generate_md_details(self, project: Dict, configuration: Dict) -> str:
         pypi_id = project.pypi_id
@@ -84,50 +308,18 @@ class PypiIntegration(BaseIntegration):
         return details_md.format(pypi_id=pypi_id)
 
     def update_via_pypistats(self, project_info: Dict) -> None:
-        # pypi stats limit is 30 per minute: https://github.com/crflynn/pypistats.org/issues/28#issuecomment-598417650
-        # So, we try 10 times
-        MAX_TRIES = 10
-        for i in range(1, MAX_TRIES):
-            try:
-                # get download count from pypi stats
-                project_info.pypi_monthly_downloads = int(
-                    json.loads(
-                        pypistats.recent(project_info.pypi_id, "month", format="json")
-                    )["data"]["last_month"]
-                )
-
-                # TODO use pepy api as fallback: https://api.pepy.tech/api/projects/lazydocs
-
-                if not project_info.monthly_downloads:
-                    project_info.monthly_downloads = 0
-
-                project_info.monthly_downloads += int(
-                    project_info.pypi_monthly_downloads
-                )
-                return
-            except (HTTPError, HTTPStatusError) as ex:
-                if ex.response.status_code == 429:
-                    sleep_time = 2 * i
-                    log.info(
-                        f"Too many requests to pypistats (429). Sleep for {sleep_time} seconds and try again."
-                    )
-                    # wait for an increasing time
-                    time.sleep(sleep_time)
-                    continue
-                else:
-                    log.info(
-                        f"Unable to request statistics from pypi: {project_info.pypi_id} ({ex.response.status_code})"
-                    )
-                    return
-            except Exception as ex:
-                log.warning(
-                    "Unable to request statistics from pypi (unexpected exception): "
-                    + project_info.pypi_id,
-                    exc_info=ex,
-                )
-                return
+        monthly_downloads = request_monthly_downloads(project_info.pypi_id)
+        if monthly_downloads is not None:
+            update_monthly_downloads(project_info, monthly_downloads)
 
-        log.warning(
-            f"Unable to request statistics from pypi after {MAX_TRIES} tries: "
-            + project_info.pypi_id
+    def update_via_downloads_dump(self, project_info: Dict) -> None:
+        monthly_downloads = (_downloads_dump or {}).get(
+            normalize_package_name(project_info.pypi_id)
         )
+        if monthly_downloads is None:
+            log.info(
+                "Unable to find package in the PyPI downloads file: "
+                + project_info.pypi_id
+            )
+            return
+        update_monthly_downloads(project_info, monthly_downloads)
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import math
 import re
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import List, Tuple
 
@@ -10,9 +12,17 @@ import pandas as pd
 from addict import Dict
 from tqdm import tqdm
 
-from best_of import default_config, integrations, utils
-from best_of.integrations import github_integration
+from best_of import default_config, http_client, integrations, utils
+from best_of.integrations import (
+    cargo_integration,
+    conda_integration,
+    dockerhub_integration,
+    github_integration,
+    libio_integration,
+    pypi_integration,
+)
 from best_of.license import get_license
+from best_of.throttling import HostConcurrencyLimiter
 
 log = logging.getLogger(__name__)
 
@@ -643,56 +653,202 @@ def calc_grouped_metrics(projects: list, config: Dict) -> None:
             log.info(f"Project group {project.group_id} does not exist.")
 
 
-def collect_projects_info(
-    projects: list, categories: OrderedDict, config: Dict
-) -> list:
-    projects_processed = []
-    unique_projects = set()
-    for project in tqdm(projects):
-        project_info = Dict(project)
+def process_project_info(
+    project_info: Dict, project: dict, categories: OrderedDict, config: Dict
+) -> None:
+    if not project_info.description:
+        project_info.description = ""
 
-        if project_info.name.lower() in unique_projects:
-            log.info("Project " + project_info.name + " is duplicated.")
+    if not project_info.updated_at and project_info.created_at:
+        # set update at if created at is available
+        project_info.updated_at = project_info.created_at
+
+    # Calculate an improved project rank metric
+    adapted_projectrank = calc_projectrank(project_info)
+    if not project_info.projectrank or project_info.projectrank < adapted_projectrank:
+        # Use the rank that is higher
+        project_info.projectrank = adapted_projectrank
+
+    # set the show flag for every project, if not shown it will be moved to the More section
+    apply_filters(project_info, config)
+
+    # make sure that all defined values (but not category) are guaranteed to be used
+    project_info.update(project)
+
+    if project_info.description:
+        # Process description
+        project_info.description = utils.process_description(
+            project_info.description, 120, ascii_only=config.ascii_description
+        )
+
+    # Check and update the project category
+    update_project_category(project_info, categories)
+
+
+def collect_project_info(project: dict) -> Dict:
+    project_info = Dict(project)
+
+    github_integration.update_via_github(project_info)
+
+    for package_manager in integrations.AVAILABLE_PACKAGE_MANAGER:
+        if package_manager.supports_batch_update:
+            # The bulk requests are applied for all projects at once via update_projects_info
+            if project_info.get(package_manager.name + "_id"):
+                package_manager.prepare_project_info(project_info)
             continue
-        unique_projects.add(project_info.name.lower())
+        package_manager.update_project_info(project_info)
 
-        github_integration.update_via_github(project_info)
+    return project_info
 
-        for package_manager in integrations.AVAILABLE_PACKAGE_MANAGER:
-            package_manager.update_project_info(project_info)
 
-        if not project_info.description:
-            project_info.description = ""
+def update_projects_info_in_batches(projects_info: List[Dict]) -> None:
+    """Applies all integrations that update the projects at once via bulk endpoints."""
+    for package_manager in integrations.AVAILABLE_PACKAGE_MANAGER:
+        if not package_manager.supports_batch_update:
+            continue
 
-        if not project_info.updated_at and project_info.created_at:
-            # set update at if created at is available
-            project_info.updated_at = project_info.created_at
+        integration_projects = [
+            project_info
+            for project_info in projects_info
+            if project_info.get(package_manager.name + "_id")
+        ]
+        if integration_projects:
+            package_manager.update_projects_info(integration_projects)
 
-        # Calculate an improved project rank metric
-        adapted_projectrank = calc_projectrank(project_info)
-        if (
-            not project_info.projectrank
-            or project_info.projectrank < adapted_projectrank
-        ):
-            # Use the rank that is higher
-            project_info.projectrank = adapted_projectrank
 
-        # set the show flag for every project, if not shown it will be moved to the More section
-        apply_filters(project_info, config)
+async def collect_projects_info_async(projects: list, config: Dict) -> list:
+    limiter = HostConcurrencyLimiter(config.host_concurrency_limits)
+    progress = tqdm(total=len(projects))
+
+    async with http_client.create_async_client() as client:
 
-        # make sure that all defined values (but not category) are guaranteed to be used
-        project_info.update(project)
+        async def collect_project_info_async(project: dict) -> Dict:
+            project_info = Dict(project)
 
-        if project_info.description:
-            # Process description
-            project_info.description = utils.process_description(
-                project_info.description, 120, ascii_only=config.ascii_description
+            await github_integration.update_via_github_async(
+                project_info, client, limiter
             )
 
-        # Check and update the project category
-        update_project_category(project_info, categories)
+            # The integrations of a single project are applied in order,
+            # since later integrations depend on the already collected metadata.
+            for package_manager in integrations.AVAILABLE_PACKAGE_MANAGER:
+                if package_manager.supports_batch_update:
+                    await package_manager.prepare_project_info_async(
+                        project_info, limiter
+                    )
+                    continue
+                await package_manager.update_project_info_async(project_info, limiter)
+
+            progress.update()
+            return project_info
+
+        # gather keeps the input order of the projects
+        projects_processed = await asyncio.gather(
+            *[collect_project_info_async(project) for project in projects]
+        )
+
+    progress.close()
+    return list(projects_processed)
+
+
+def collect_projects_info(
+    projects: list, categories: OrderedDict, config: Dict
+) -> list:
+    unique_projects = set()
+    selected_projects = []
+    for project in projects:
+        project_name = Dict(project).name
+        if project_name.lower() in unique_projects:
+            log.info("Project " + project_name + " is duplicated.")
+            continue
+        unique_projects.add(project_name.lower())
+        selected_projects.append(project)
+
+    github_integration.configure(stats_ttl=float(config.github_stats_ttl))
+    libio_integration.configure(cache_ttl=float(config.libio_cache_ttl))
+    pypi_integration.configure(downloads_file=config.pypi_downloads_file)
+    conda_integration.configure(
+        channeldata=bool(config.conda_channeldata),
+        channeldata_files=config.conda_channeldata_files,
+    )
+    cargo_integration.configure(dump_folder=config.cargo_dump_folder)
+    github_ids = [Dict(project).github_id for project in selected_projects]
+    if config.github_change_probe:
+        # Unchanged repositories reuse the metadata of the last run
+        github_integration.probe_metadata_changes(
+            github_ids, float(config.github_snapshot_max_age)
+        )
+    if config.github_batch_queries:
+        # Request the GitHub metadata of many repositories per query upfront
+        github_integration.prefetch_metadata_from_github_api(github_ids)
+    # Allows to pace the remaining queries according to the GraphQL budget
+    github_integration.expect_metadata_queries(github_ids)
+    # Package lookups of libraries.io are bundled into bulk requests upfront
+    libio_integration.prefetch_packages_via_libio(
+        [Dict(project) for project in selected_projects]
+    )
+
+    # The channeldata of every conda channel is loaded once for all projects
+    conda_integration.prefetch_channeldata(
+        [Dict(project) for project in selected_projects]
+    )
+
+    # Crates are indexed from the crates.io database dump instead of requesting the api
+    cargo_integration.prefetch_crates_dump(
+        [Dict(project) for project in selected_projects]
+    )
+
+    # Namespaces with many images are listed at once instead of requesting every image
+    dockerhub_integration.prefetch_namespace_images(
+        [Dict(project) for project in selected_projects]
+    )
+
+    # pypistats is slowest due to its rate limit, so it does not block the other integrations
+    pypi_integration.start_pypistats_queue()
+
+    max_workers = max(1, int(config.max_workers or 1))
+    if config.async_collection:
+        # All projects are collected within a single event loop, the concurrency
+        # is only limited by the configured connection limits per host.
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(
+            max_workers=HostConcurrencyLimiter(
+                config.host_concurrency_limits
+            ).total_limit
+        )
+        try:
+            loop.set_default_executor(executor)
+            projects_processed = loop.run_until_complete(
+                collect_projects_info_async(selected_projects, config)
+            )
+        finally:
+            loop.close()
+            executor.shutdown()
+    elif max_workers == 1:
+        projects_processed = [
+            collect_project_info(project) for project in tqdm(selected_projects)
+        ]
+    else:
+        # Projects are independent from each other, so the enrichment can run concurrently.
+        # executor.map keeps the input order, so the result is identical to the sequential run.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            projects_processed = list(
+                tqdm(
+                    executor.map(collect_project_info, selected_projects),
+                    total=len(selected_projects),
+                )
+            )
+
+    # Integrations with bulk endpoints are applied once for all projects
+    update_projects_info_in_batches(projects_processed)
+    # The monthly downloads are required for the projectrank
+    pypi_integration.finish_pypistats_queue()
+
+    for project_info, project in zip(projects_processed, selected_projects):
+        process_project_info(project_info, project, categories, config)
 
-        projects_processed.append(project_info)
+    # Stale dependents and contributors are refreshed in the background for the next run
+    github_integration.finish_github_stats_refresh()
 
     calc_grouped_metrics(projects_processed, config)
     projects_processed = sort_projects(projects_processed, config)
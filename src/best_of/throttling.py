@@ -0,0 +1,244 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from best_of import default_config
+
+# Used for all hosts that are not explicitly configured
+DEFAULT_HOST_CONCURRENCY_LIMIT = 5
+
+
+class HostSlots:
+    """Async context manager that holds one connection slot for each of the given hosts."""
+
+    def __init__(self, semaphores: List[asyncio.Semaphore]):
+        self._semaphores = semaphores
+
+    async def __aenter__(self) -> "HostSlots":
+        acquired: List[asyncio.Semaphore] = []
+        try:
+            for semaphore in self._semaphores:
+                await semaphore.acquire()
+                acquired.append(semaphore)
+        except BaseException:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        for semaphore in reversed(self._semaphores):
+            semaphore.release()
+
+
+class HostConcurrencyLimiter:
+    """Caps the number of concurrent requests per upstream host within an event loop.
+
+    Args:
+        limits (dict): Maximum number of concurrent requests per host.
+        default_limit (int, optional): Limit used for hosts that are not configured in `limits`.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: int = DEFAULT_HOST_CONCURRENCY_LIMIT,
+    ):
+        self._limits = {host: int(limit) for host, limit in (limits or {}).items()}
+        self._default_limit = default_limit
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def total_limit(self) -> int:
+        """Returns the maximum number of concurrent requests across all configured hosts."""
+        return max(1, sum(self._limits.values()))
+
+    def get_limit(self, host: str) -> int:
+        return max(1, self._limits.get(host, self._default_limit))
+
+    def limit(self, *hosts: str) -> HostSlots:
+        """Returns a context manager that holds a slot for every given host.
+
+        The semaphores are always acquired in the same (sorted) order to prevent deadlocks
+        between callers that need slots for multiple hosts.
+        """
+        semaphores = []
+        for host in sorted(set(hosts)):
+            if host not in self._semaphores:
+                # Lazily created to bind the semaphore to the running event loop
+                self._semaphores[host] = asyncio.Semaphore(self.get_limit(host))
+            semaphores.append(self._semaphores[host])
+        return HostSlots(semaphores)
+
+
+class RateLimiter:
+    """Thread-safe token bucket that allows `requests` requests per `period` seconds.
+
+    Every caller reserves a token before sending a request and waits until the token
+    is available. With the default `burst` of 1, the requests are spread evenly
+    across the period, so the budget of the host is never exceeded.
+
+    Args:
+        requests (int): Number of allowed requests per period.
+        period (float): Length of the period in seconds.
+        burst (int, optional): Maximum number of requests that can be sent at once.
+    """
+
+    def __init__(self, requests: int, period: float, burst: int = 1):
+        self._rate = max(1, int(requests)) / float(period)
+        self._capacity = float(max(1, burst))
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Reserves a token and returns the time in seconds until it can be used."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity, self._tokens + (now - self._updated_at) * self._rate
+            )
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self) -> None:
+        """Blocks until a request is allowed."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self) -> None:
+        """Waits within the event loop until a request is allowed."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+
+class RateLimitBudget:
+    """Thread-safe pacer for a budget of points that is reset at a known time.
+
+    The remaining points and the reset time are updated from the responses of the host.
+    As long as the expected cost of all pending requests fits into the remaining points,
+    requests are sent immediately. Otherwise, the remaining points are spread evenly
+    until the reset, so that the budget is used up exactly when it is reset instead of
+    running out in the middle of the collection.
+    """
+
+    def __init__(self) -> None:
+        self._remaining: Optional[float] = None
+        self._reset_at: Optional[float] = None
+        self._average_cost: Optional[float] = None
+        self._pending = 0
+        self._next_request_at = 0.0
+        self._lock = threading.Lock()
+
+    def set_pending(self, requests: int) -> None:
+        """Sets the number of requests that are expected to be sent."""
+        with self._lock:
+            self._pending = max(0, int(requests))
+
+    def update(self, cost: float, remaining: float, reset_at: float) -> None:
+        """Updates the budget with the values reported by the host.
+
+        Args:
+            cost (float): Points consumed by the last request.
+            remaining (float): Points remaining in the current period.
+            reset_at (float): Unix timestamp of the next reset.
+        """
+        with self._lock:
+            if self._average_cost is None:
+                self._average_cost = float(cost)
+            else:
+                self._average_cost = 0.8 * self._average_cost + 0.2 * float(cost)
+            self._remaining = float(remaining)
+            self._reset_at = float(reset_at)
+
+    def reserve(self) -> float:
+        """Reserves the points for a request and returns the time in seconds until it can be sent."""
+        with self._lock:
+            now = time.time()
+            pending = max(1, self._pending)
+            self._pending = max(0, self._pending - 1)
+
+            if self._remaining is None or self._reset_at is None:
+                # Nothing is known about the budget yet
+                return 0.0
+
+            if now >= self._reset_at:
+                # The budget was reset since the last update
+                return 0.0
+
+            cost = max(1.0, self._average_cost or 1.0)
+            time_until_reset = self._reset_at - now
+            if self._remaining < cost:
+                # Budget is exhausted, wait for the reset
+                return time_until_reset + 1
+
+            if pending * cost <= self._remaining:
+                self._remaining -= cost
+                return 0.0
+
+            # Spread the remaining points evenly until the reset
+            interval = time_until_reset * cost / self._remaining
+            scheduled_at = max(now, self._next_request_at)
+            self._next_request_at = scheduled_at + interval
+            self._remaining -= cost
+            return scheduled_at - now
+
+    def acquire(self) -> None:
+        """Blocks until the next request fits into the budget."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+    async def acquire_async(self) -> None:
+        """Waits within the event loop until the next request fits into the budget."""
+        wait_time = self.reserve()
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+
+_rate_limits: Dict[str, Sequence[float]] = dict(default_config.HOST_RATE_LIMITS)
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def configure_rate_limits(rate_limits: Dict[str, Sequence[float]]) -> None:
+    """Sets the request budget per host.
+
+    Args:
+        rate_limits (dict): Maps a host to a `[requests, period in seconds]` budget.
+    """
+    with _rate_limiters_lock:
+        _rate_limits.clear()
+        _rate_limits.update(rate_limits)
+        _rate_limiters.clear()
+
+
+def get_rate_limiter(host: str) -> Optional[RateLimiter]:
+    """Returns the shared rate limiter of the host or `None` if the host is not limited."""
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            if host not in _rate_limits or not _rate_limits[host]:
+                return None
+            requests, period = _rate_limits[host]
+            _rate_limiters[host] = RateLimiter(int(requests), float(period))
+        return _rate_limiters[host]
+
+
+def acquire(host: str) -> None:
+    """Blocks until the next request to the host is allowed by its budget."""
+    rate_limiter = get_rate_limiter(host)
+    if rate_limiter:
+        rate_limiter.acquire()
+
+
+async def acquire_async(host: str) -> None:
+    """Waits within the event loop until the next request to the host is allowed."""
+    rate_limiter = get_rate_limiter(host)
+    if rate_limiter:
+        await rate_limiter.acquire_async()
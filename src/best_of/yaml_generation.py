@@ -5,15 +5,15 @@ import re
 import urllib.request
 from typing import List, Optional, Union
 
-import requests
 import requirements
 from addict import Dict
 from tqdm import tqdm
 
-from best_of import projects_collection, utils
+from best_of import caching, http_client, projects_collection, utils
 from best_of.integrations import (
     conda_integration,
     github_integration,
+    libio_integration,
     npm_integration,
     pypi_integration,
 )
@@ -35,15 +35,22 @@ query($organization: String!) {
  }
     """
 
-    headers = {"Authorization": "token " + os.environ["GITHUB_API_KEY"]}
+    github_api_token = github_integration.get_github_token()
+    if not github_api_token:
+        log.info("A GitHub API key is required to request GitHub orgs.")
+        return []
+
+    headers = {"Authorization": "token " + github_api_token}
     variables = {"organization": organization}
 
     try:
-        response = requests.post(
+        response = http_client.post(
             "https://api.github.com/graphql",
             json={"query": query, "variables": variables},
             headers=headers,
+            is_cacheable=http_client.is_graphql_response_cacheable,
         )
+        github_integration.update_token_quota(github_api_token, response)
         if response.status_code != 200:
             log.info(
                 "Unable to find GitHub org via GitHub api: "
@@ -77,7 +84,20 @@ def collect_github_projects(
     excluded_github_ids: Optional[List[str]] = None,
     existing_projects: Optional[List[Dict]] = None,
     group: Optional[str] = None,
+    cache_folder: Optional[str] = None,
 ) -> list:
+    """Collects the metadata of the given GitHub repos as projects.
+
+    Repos that were renamed since a previous run are resolved to their current name via
+    the persistent caches. If `cache_folder` is not provided, the caches need to be
+    activated via `caching.configure` before, otherwise renames are not resolved.
+    """
+    if cache_folder:
+        caching.configure(cache_folder)
+    elif caching.get_cache("github-identities") is None:
+        log.info(
+            "The persistent caches are not configured, renamed GitHub repos are not resolved."
+        )
 
     projects: List = []
 
@@ -103,11 +123,19 @@ def collect_github_projects(
 
     # extract github project urls
     for github_id in tqdm(repos):
-        if utils.simplify_str(github_id) in added_projects:
+        # Use the current name of repos that were renamed since a previous run
+        resolved_github_id = github_integration.resolve_github_id(github_id)
+        if (
+            utils.simplify_str(github_id) in added_projects
+            or utils.simplify_str(resolved_github_id) in added_projects
+        ):
             # project already added
             continue
 
-        if utils.simplify_str(github_id) in excluded_projects:
+        if (
+            utils.simplify_str(github_id) in excluded_projects
+            or utils.simplify_str(resolved_github_id) in excluded_projects
+        ):
             # skip excluded projects
             continue
 
@@ -411,15 +439,11 @@ def extract_pypi_projects_from_requirements(
 def auto_extend_via_libio(
     projects: list, selected_package_manager: Optional[List[str]] = None
 ) -> list:
-    from pybraries.search import Search
-
     updated_projects = []
     for project in tqdm(projects):
         project = copy.deepcopy(project)
         if "github_id" in project:
-            search = Search()
-            related_projects = search.repository_projects(
-                host="github",
+            related_projects = libio_integration.request_repository_projects(
                 owner=project["github_id"].split("/")[0],
                 repo=project["github_id"].split("/")[1],
             )
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import httpx
+
+from best_of import caching, http_client
+
+
+def test_response_cache_revalidation(tmp_path, monkeypatch):
+    sent_requests = []
+
+    def send(method, url, **kwargs):
+        headers = kwargs.get("headers") or {}
+        sent_requests.append(headers)
+        request = httpx.Request(method, url)
+        if headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(
+            200, headers={"ETag": '"v1"'}, json={"stars": 10}, request=request
+        )
+
+    monkeypatch.setattr(http_client, "send", send)
+    caching.configure(str(tmp_path))
+    try:
+        http_client.configure(cache_ttls={"api.github.com": 60})
+        url = "https://api.github.com/repos/best-of-lists/best-of-generator"
+
+        assert http_client.get(url).json() == {"stars": 10}
+        assert http_client.get(url).json() == {"stars": 10}
+        assert len(sent_requests) == 1
+
+        # Expire the cached response
+        http_client.configure(cache_ttls={"api.github.com": -1})
+        assert http_client.get(url).json() == {"stars": 10}
+        assert len(sent_requests) == 2
+        assert sent_requests[-1]["If-None-Match"] == '"v1"'
+    finally:
+        caching.configure(None)
+        http_client.configure()
+
+
+def test_graphql_errors_are_not_cached(tmp_path, monkeypatch):
+    responses = [
+        httpx.Response(200, json={"errors": [{"type": "RATE_LIMITED"}]}),
+        httpx.Response(200, json={"data": {"stars": 1}}),
+        httpx.Response(200, json={"data": {"stars": 2}}),
+    ]
+    monkeypatch.setattr(http_client, "send", lambda *args, **kwargs: responses.pop(0))
+
+    caching.configure(str(tmp_path))
+    try:
+        url = "https://api.github.com/graphql"
+        for expected in [None, 1, 1]:
+            response = http_client.post(
+                url,
+                json={"query": "{ stars }"},
+                is_cacheable=http_client.is_graphql_response_cacheable,
+            )
+            assert response.json().get("data", {}).get("stars") == expected
+        assert len(responses) == 1
+    finally:
+        caching.configure(None)
+
+
+def test_async_requests_access_cache_outside_event_loop(tmp_path, monkeypatch):
+    requested_urls = []
+    cache_threads = []
+
+    def handler(request):
+        requested_urls.append(str(request.url))
+        return httpx.Response(200, json={"data": {"stars": 1}})
+
+    original_set = caching.PersistentCache.set
+
+    def set(self, key, value):
+        cache_threads.append(threading.current_thread())
+        original_set(self, key, value)
+
+    monkeypatch.setattr(caching.PersistentCache, "set", set)
+
+    async def request_twice():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            for _ in range(2):
+                response = await http_client.request_async(
+                    client, "POST", "https://gitlab.com/api/graphql", json={}
+                )
+                assert response.json() == {"data": {"stars": 1}}
+
+    caching.configure(str(tmp_path))
+    try:
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(request_twice())
+        finally:
+            loop.close()
+    finally:
+        caching.configure(None)
+
+    assert len(requested_urls) == 1
+    assert cache_threads and threading.main_thread() not in cache_threads
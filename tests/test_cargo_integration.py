@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import httpx
+from addict import Dict
+
+from best_of import http_client
+from best_of.integrations import cargo_integration
+
+
+def test_crates_are_loaded_from_dump(monkeypatch, tmp_path):
+    requested_urls = []
+
+    def get(url, **kwargs):
+        requested_urls.append(url)
+        return httpx.Response(
+            200,
+            json={"crate": {"downloads": 50, "recent_downloads": 30}},
+            request=httpx.Request("GET", url),
+        )
+
+    monkeypatch.setattr(http_client, "get", get)
+
+    data_folder = tmp_path / "2021-01-01-020000" / "data"
+    data_folder.mkdir(parents=True)
+    (data_folder / "crates.csv").write_text(
+        "created_at,description,documentation,homepage,id,max_upload_size,name,repository,updated_at\n"
+        "2018-01-01 10:00:00.000000,Serialization framework,,https://serde.rs,1,,serde,,2020-06-01 10:00:00.000000\n"
+        "2019-01-01 10:00:00.000000,Other crate,,,2,,other,,2020-01-01 10:00:00.000000\n"
+    )
+    (data_folder / "crate_downloads.csv").write_text(
+        "crate_id,downloads\n1,1000\n2,10\n"
+    )
+    (data_folder / "versions.csv").write_text(
+        "crate_id,created_at,downloads,id,num,yanked\n"
+        "1,2020-01-01 10:00:00.000000,10,1,1.0.0,f\n"
+        "1,2020-06-01 10:00:00.000000,10,2,1.1.0,f\n"
+        "1,2020-07-01 10:00:00.000000,10,3,1.2.0,t\n"
+        "2,2020-01-01 10:00:00.000000,10,4,0.1.0,f\n"
+    )
+    # Only the downloads of the last 90 days are counted
+    (data_folder / "version_downloads.csv").write_text(
+        "date,downloads,version_id\n"
+        "2020-06-01,1000,1\n"
+        "2020-09-01,100,1\n"
+        "2020-09-01,150,2\n"
+        "2020-10-01,50,3\n"
+        "2020-10-01,3,4\n"
+    )
+
+    cargo_integration.configure(dump_folder=str(data_folder.parent))
+    try:
+        projects_info = [Dict(cargo_id="serde"), Dict(cargo_id="missing")]
+        cargo_integration.prefetch_crates_dump(projects_info)
+        for project_info in projects_info:
+            cargo_integration.CargoIntegration().update_project_info(project_info)
+    finally:
+        cargo_integration.configure()
+
+    project_info = projects_info[0]
+    assert project_info.cargo_monthly_downloads == 100
+    assert project_info.cargo_total_downloads == 1000
+    assert project_info.description == "Serialization framework"
+    assert project_info.release_count == 2
+    assert project_info.latest_stable_release_number == "1.1.0"
+    assert project_info.cargo_latest_release_published_at == datetime(2020, 6, 1, 10)
+    assert project_info.created_at == datetime(2018, 1, 1, 10)
+    # Crates that are missing in the dump are requested via the crates.io api
+    assert requested_urls == ["https://crates.io/api/v1/crates/missing"]
+    assert projects_info[1].cargo_total_downloads == 50
+    assert projects_info[1].cargo_monthly_downloads == 10
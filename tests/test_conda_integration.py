@@ -0,0 +1,167 @@
+import json
+from datetime import datetime
+
+import httpx
+from addict import Dict
+
+from best_of import http_client
+from best_of.integrations import conda_integration
+
+
+def test_read_conda_package_sums_file_downloads():
+    package = {
+        "name": "best-of",
+        "summary": "A best-of list",
+        "created_at": "2021-01-01 00:00:00.000000+00:00",
+        "versions": ["0.1.0", "0.2.0"],
+        "files": [
+            {"ndownloads": 1000 + i, "attrs": {"depends": ["python"]}}
+            for i in range(100)
+        ],
+        "modified_at": "2021-06-01 00:00:00.000000+00:00",
+        "watchers": 123456,
+    }
+    content = json.dumps(package, indent=1).encode("utf-8")
+
+    def chunks():
+        # Splits numbers, strings, and file entries across chunks
+        for start in range(0, len(content), 7):
+            yield content[start : start + 7]
+
+    conda_info = conda_integration.read_conda_package(chunks())
+    assert conda_info.total_downloads == sum(1000 + i for i in range(100))
+    assert conda_info.summary == "A best-of list"
+    assert conda_info.versions == ["0.1.0", "0.2.0"]
+    assert conda_info.modified_at == package["modified_at"]
+    assert "files" not in conda_info
+    assert "watchers" not in conda_info
+    assert conda_integration.parse_conda_package(content.decode("utf-8")) == conda_info
+
+
+def test_numbers_are_parsed_across_chunk_boundaries():
+    class Parser(conda_integration.JsonStreamParser):
+        STREAMED_MEMBERS = {"files"}
+
+        def __init__(self):
+            super().__init__()
+            self.values = {}
+
+        def handle_member(self, key, value):
+            self.values[key] = value
+
+        def handle_entry(self, member, key, value):
+            self.values.setdefault(member, []).append(value)
+
+    content = json.dumps(
+        {"size": 12.5, "score": 1.25e10, "count": -30, "files": [1.5, 22, 3e-4]}
+    )
+    # Cuts the numbers at every position, e.g. `12.` or `1.25e`
+    for chunk_size in range(1, len(content) + 1):
+        parser = Parser()
+        for start in range(0, len(content), chunk_size):
+            parser.feed(content[start : start + chunk_size])
+        parser.feed("", final=True)
+        assert parser.values == json.loads(content)
+
+
+def test_channeldata_is_loaded_once_per_channel(monkeypatch, tmp_path):
+    channeldata_file = tmp_path / "channeldata.json"
+    channeldata_file.write_text(
+        json.dumps(
+            {
+                "channeldata_version": 1,
+                "packages": {
+                    "best-of": {
+                        "version": "1.2.0",
+                        "summary": "A best-of list",
+                        "timestamp": 1609459200000,
+                        "license": "MIT",
+                        "subdirs": ["noarch"],
+                    },
+                    "other": {"version": "0.1.0"},
+                },
+                "subdirs": ["noarch"],
+            }
+        )
+    )
+    streamed_urls = []
+
+    def stream(url, **kwargs):
+        streamed_urls.append(url)
+        packages = {
+            name: {"version": "1.0", "timestamp": 1609459200}
+            for name in ["a", "b", "c", "untracked"]
+        }
+        return httpx.Response(200, json={"packages": packages})
+
+    api_updates = []
+
+    def update_via_conda_api(self, project_info, with_channeldata=False):
+        api_updates.append((project_info.conda_id, with_channeldata))
+
+    monkeypatch.setattr(http_client, "stream", stream)
+    monkeypatch.setattr(
+        conda_integration.CondaIntegration, "update_via_conda_api", update_via_conda_api
+    )
+
+    conda_integration.configure(
+        channeldata=True, channeldata_files={"conda-forge": str(channeldata_file)}
+    )
+    try:
+        projects_info = [
+            Dict(conda_id="conda-forge/best-of"),
+            Dict(conda_id="conda-forge/missing"),
+            Dict(conda_id="numpy"),
+            Dict(conda_id="bioconda/a"),
+            Dict(conda_id="bioconda/b"),
+            Dict(conda_id="bioconda/c"),
+        ]
+        conda_integration.prefetch_channeldata(projects_info)
+        # The anaconda channel has too few tracked packages
+        assert streamed_urls == ["https://conda.anaconda.org/bioconda/channeldata.json"]
+
+        for project_info in projects_info:
+            conda_integration.CondaIntegration().update_project_info(project_info)
+
+        project_info = projects_info[0]
+        assert project_info.conda_latest_release_published_at == datetime(2021, 1, 1)
+        assert project_info.latest_stable_release_number == "1.2.0"
+        assert project_info.description == "A best-of list"
+        assert project_info.license == "MIT"
+        assert projects_info[3].latest_stable_release_number == "1.0"
+        assert projects_info[3].updated_at == datetime(2021, 1, 1)
+        assert api_updates == [
+            ("conda-forge/best-of", True),
+            ("conda-forge/missing", False),
+            ("numpy", False),
+            ("bioconda/a", True),
+            ("bioconda/b", True),
+            ("bioconda/c", True),
+        ]
+    finally:
+        conda_integration.configure()
+
+
+def test_conda_api_with_channeldata(monkeypatch):
+    package = {
+        "summary": "Summary from the api",
+        "created_at": "2021-01-01 00:00:00.000000+00:00",
+        "modified_at": "2021-06-01 00:00:00.000000+00:00",
+        "versions": ["0.1.0"],
+        "files": [{"ndownloads": 1000000}, {"ndownloads": 500000}],
+    }
+    monkeypatch.setattr(
+        http_client, "stream", lambda url, **kwargs: httpx.Response(200, json=package)
+    )
+
+    project_info = Dict(conda_id="conda-forge/best-of")
+    conda_integration.CondaIntegration().update_via_conda_api(
+        project_info, with_channeldata=True
+    )
+    assert project_info.conda_total_downloads == 1500000
+    assert project_info.monthly_downloads
+    # Metadata that is not part of the channeldata is still used
+    assert project_info.created_at == datetime(2021, 1, 1)
+    assert project_info.release_count == 1
+    assert not project_info.description
+    assert not project_info.conda_latest_release_published_at
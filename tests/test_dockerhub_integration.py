@@ -0,0 +1,87 @@
+import httpx
+from addict import Dict
+
+from best_of import http_client
+from best_of.integrations import dockerhub_integration
+
+
+def test_images_are_listed_per_namespace(monkeypatch):
+    requested_urls = []
+
+    def get(url, **kwargs):
+        requested_urls.append(url)
+        if url.endswith("/best-of/?page_size=100"):
+            return httpx.Response(
+                200,
+                json={
+                    "count": 150,
+                    "next": "https://hub.docker.com/v2/repositories/best-of/?page=2",
+                    "results": [
+                        {"name": "image-a", "star_count": 1, "pull_count": 10},
+                        {"name": "untracked", "star_count": 5},
+                    ],
+                },
+            )
+        if url.endswith("/best-of/?page=2"):
+            return httpx.Response(
+                200,
+                json={
+                    "next": None,
+                    "results": [{"name": "image-b", "star_count": 2}],
+                },
+            )
+        return httpx.Response(200, json={"name": "image", "star_count": 3})
+
+    monkeypatch.setattr(http_client, "get", get)
+
+    projects_info = [
+        Dict(dockerhub_id="best-of/image-a"),
+        Dict(dockerhub_id="best-of/image-b"),
+        Dict(dockerhub_id="best-of/image-c"),
+        Dict(dockerhub_id="other/image"),
+        Dict(dockerhub_id="python"),
+    ]
+    dockerhub_integration.prefetch_namespace_images(projects_info)
+    assert len(requested_urls) == 2
+
+    for project_info in projects_info:
+        dockerhub_integration.DockerhubIntegration().update_project_info(project_info)
+
+    assert [project_info.dockerhub_stars for project_info in projects_info] == [
+        1,
+        2,
+        3,
+        3,
+        3,
+    ]
+    assert projects_info[0].dockerhub_pulls == 10
+    # Images that are missing in the listing are requested on their own
+    assert requested_urls[2:] == [
+        "https://hub.docker.com/v2/repositories/best-of/image-c",
+        "https://hub.docker.com/v2/repositories/other/image",
+        "https://hub.docker.com/v2/repositories/library/python",
+    ]
+
+
+def test_large_namespaces_are_not_paged(monkeypatch):
+    requested_urls = []
+
+    def get(url, **kwargs):
+        requested_urls.append(url)
+        return httpx.Response(
+            200,
+            json={
+                "count": 1000,
+                "next": "https://hub.docker.com/v2/repositories/best-of/?page=2",
+                "results": [{"name": "image-a", "star_count": 1}],
+            },
+        )
+
+    monkeypatch.setattr(http_client, "get", get)
+
+    images = dockerhub_integration.request_namespace_repositories("best-of", 3)
+    # Ten pages would need more requests than the three images on their own
+    assert requested_urls == [
+        "https://hub.docker.com/v2/repositories/best-of/?page_size=100"
+    ]
+    assert [image.name for image in images] == ["image-a"]
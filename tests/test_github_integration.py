@@ -0,0 +1,299 @@
+import time
+from datetime import datetime
+
+import httpx
+from addict import Dict
+
+from best_of import caching, default_config, http_client
+from best_of.integrations import github_integration
+
+
+def test_get_next_batch_size():
+    assert github_integration.get_next_batch_size(10, 5) == 40
+    assert github_integration.get_next_batch_size(10, 50) == 10
+    assert github_integration.get_next_batch_size(10, 1000) == 1
+    assert github_integration.get_next_batch_size(10, None) == 10
+
+
+def test_request_metadata_batch(monkeypatch):
+    def post(url, json, **kwargs):
+        assert "repo1: repository(owner: $owner1, name: $repo1)" in json["query"]
+        assert json["variables"]["owner1"] == "octo"
+        assert json["variables"]["repo1"] == "missing"
+        data = {
+            "repo0": {"nameWithOwner": "best-of-lists/best-of"},
+            "repo1": None,
+            "rateLimit": {"cost": 2},
+        }
+        return httpx.Response(200, json={"data": data})
+
+    monkeypatch.setattr(http_client, "post", post)
+
+    metadata, cost = github_integration.request_metadata_batch_from_github_api(
+        "token", ["best-of-lists/best-of", "octo/missing"], datetime(2021, 1, 1)
+    )
+    assert cost == 2
+    assert list(metadata) == ["best-of-lists/best-of"]
+    assert metadata["best-of-lists/best-of"].nameWithOwner == "best-of-lists/best-of"
+
+
+def test_probe_metadata_changes(monkeypatch, tmp_path):
+    monkeypatch.setenv("GITHUB_API_KEY", "token")
+    caching.configure(str(tmp_path))
+    try:
+        for github_id, star_count in [
+            ("best-of/unchanged", 10),
+            ("best-of/changed", 5),
+        ]:
+            github_info = Dict(
+                nameWithOwner=github_id,
+                pushedAt="2021-01-01T00:00:00Z",
+                stargazers={"totalCount": star_count},
+                releases={"nodes": [{"createdAt": "2020-12-01T00:00:00Z"}]},
+            )
+            github_integration.store_metadata_snapshot(github_id, github_info)
+
+        def post(url, json, **kwargs):
+            assert "...RepositoryProbe" in json["query"]
+            assert kwargs["use_cache"] is False
+            probe = {
+                "pushedAt": "2021-01-01T00:00:00Z",
+                "stargazers": {"totalCount": 10},
+                "releases": {"nodes": [{"createdAt": "2020-12-01T00:00:00Z"}]},
+            }
+            return httpx.Response(200, json={"data": {"repo0": probe, "repo1": probe}})
+
+        monkeypatch.setattr(http_client, "post", post)
+        github_integration.probe_metadata_changes(
+            ["best-of/unchanged", "best-of/changed", "best-of/new"], 3600
+        )
+
+        unchanged = github_integration.pop_prefetched_metadata("best-of/unchanged")
+        assert unchanged.nameWithOwner == "best-of/unchanged"
+        assert github_integration.pop_prefetched_metadata("best-of/changed") is None
+        assert github_integration.pop_prefetched_metadata("best-of/new") is None
+    finally:
+        caching.configure(None)
+
+
+def test_update_release_ledger(monkeypatch, tmp_path):
+    def create_release(i):
+        return {
+            "id": "release-" + str(i),
+            "createdAt": "2021-01-%02dT00:00:00Z" % i,
+            "tagName": "v" + str(i),
+            "releaseAssets": {"nodes": [{"downloadCount": 1}, {"downloadCount": 2}]},
+        }
+
+    def get_github_info(first, last):
+        recent_releases = [create_release(i) for i in range(last, first - 1, -1)]
+        return Dict(releases={"totalCount": last, "nodes": recent_releases})
+
+    requested_pages = []
+
+    def post(url, json, **kwargs):
+        requested_pages.append(json["variables"]["cursor"])
+        releases = {
+            "pageInfo": {"hasNextPage": False, "endCursor": "cursor-12"},
+            "nodes": [create_release(i) for i in range(1, 13)],
+        }
+        return httpx.Response(
+            200, json={"data": {"repository": {"releases": releases}}}
+        )
+
+    monkeypatch.setattr(http_client, "post", post)
+    caching.configure(str(tmp_path))
+    try:
+        # The first run requests all releases
+        github_info = get_github_info(3, 12)
+        github_integration.update_release_ledger("token", "best-of/repo", github_info)
+        assert requested_pages == [None]
+        assert len(github_info.releases.nodes) == 12
+        assert github_info.releases.nodes[0].tagName == "v12"
+        assert github_info.releases.nodes[-1].releaseAssets.nodes[0].downloadCount == 3
+
+        # New releases are covered by the recent releases of the metadata
+        github_info = get_github_info(5, 14)
+        github_integration.update_release_ledger("token", "best-of/repo", github_info)
+        assert requested_pages == [None]
+        assert len(github_info.releases.nodes) == 14
+        assert github_info.releases.nodes[0].tagName == "v14"
+    finally:
+        caching.configure(None)
+
+
+def test_github_stats_refresh(monkeypatch, tmp_path):
+    monkeypatch.setattr(github_integration, "get_repo_deps_via_github", lambda _: 20)
+    monkeypatch.setattr(
+        github_integration, "get_contributors_via_github_api", lambda *_: 5
+    )
+    caching.configure(str(tmp_path))
+    try:
+        github_integration.store_github_stats("best-of/repo", 10, 2)
+        stats, is_fresh = github_integration.get_cached_github_stats("best-of/repo")
+        assert is_fresh
+        assert stats["dependent_project_count"] == 10
+
+        github_integration.configure(stats_ttl=-1)
+        stats, is_fresh = github_integration.get_cached_github_stats("best-of/repo")
+        assert not is_fresh
+
+        github_integration.schedule_github_stats_refresh("best-of/repo", "token")
+        github_integration.finish_github_stats_refresh()
+        stats, _ = github_integration.get_cached_github_stats("best-of/repo")
+        assert stats == {"dependent_project_count": 20, "contributor_count": 5}
+
+        # Partial results are not cached
+        github_integration.store_github_stats("best-of/partial", 10, None)
+        assert github_integration.get_cached_github_stats("best-of/partial") is None
+
+        # The refreshes per run are capped
+        monkeypatch.setattr(github_integration, "GITHUB_STATS_MAX_REFRESHES", 1)
+        refreshed = []
+        monkeypatch.setattr(
+            github_integration,
+            "request_github_stats",
+            lambda github_id, _: refreshed.append(github_id),
+        )
+        for github_id in ["best-of/a", "best-of/b"]:
+            github_integration.schedule_github_stats_refresh(github_id, "token")
+        github_integration.finish_github_stats_refresh()
+        assert refreshed == ["best-of/a"]
+    finally:
+        github_integration.configure()
+        caching.configure(None)
+
+
+def test_github_stats_ttl_jitter():
+    ttls = {
+        github_integration.get_github_stats_ttl("best-of/repo-" + str(i))
+        for i in range(20)
+    }
+    assert len(ttls) > 1
+    assert all(
+        0.75 * default_config.GITHUB_STATS_TTL <= ttl <= default_config.GITHUB_STATS_TTL
+        for ttl in ttls
+    )
+    assert github_integration.get_github_stats_ttl(
+        "best-of/Repo"
+    ) == github_integration.get_github_stats_ttl("best-of/repo")
+
+
+def test_read_repo_deps_stops_after_counters():
+    html = (
+        "<a href='?dependent_type=REPOSITORY'>\n  1,234\n  Repositories\n</a>"
+        "<a href='?dependent_type=PACKAGE'>\n  56\n  Packages\n</a>"
+    ).encode("utf-8")
+    read_chunks = []
+
+    def chunks():
+        # Splits the counters across chunks
+        for start in range(0, len(html), 7):
+            read_chunks.append(start)
+            yield html[start : start + 7]
+        while True:
+            read_chunks.append(None)
+            yield b"<div>" * 1000
+
+    assert github_integration.read_repo_deps(chunks()) == 1290
+    assert None not in read_chunks
+    assert github_integration.parse_repo_deps(html.decode("utf-8")) == 1290
+
+
+def test_github_token_pool_rotation(monkeypatch, tmp_path):
+    token_file = tmp_path / "tokens.txt"
+    token_file.write_text("# comment\ntoken-b\ntoken-c\n")
+    monkeypatch.setenv("GITHUB_API_KEY", "token-a, token-b")
+    monkeypatch.setenv("GITHUB_API_KEY_FILE", str(token_file))
+
+    token_pool = github_integration.get_token_pool()
+    assert token_pool.tokens == ["token-a", "token-b", "token-c"]
+
+    for token, remaining in [("token-a", 100), ("token-b", 4000), ("token-c", 50)]:
+        response = httpx.Response(
+            200,
+            headers={
+                "X-RateLimit-Resource": "graphql",
+                "X-RateLimit-Remaining": str(remaining),
+                "X-RateLimit-Reset": str(int(time.time()) + 600),
+            },
+        )
+        github_integration.update_token_quota(token, response)
+
+    assert github_integration.get_github_token() == "token-b"
+    # The core quota of all tokens is still unknown
+    assert github_integration.get_github_token("core") == "token-a"
+    assert token_pool.get_total_quota("graphql")[0] == 4150
+
+
+def test_github_identity_is_requested_by_node_id(monkeypatch, tmp_path):
+    requests = []
+
+    def post(url, json, **kwargs):
+        requests.append(json)
+        github_info = {"id": "R_1", "nameWithOwner": "best-of/renamed"}
+        if "ids" in json["variables"]:
+            return httpx.Response(200, json={"data": {"nodes": [github_info]}})
+        return httpx.Response(200, json={"data": {"repo0": github_info}})
+
+    monkeypatch.setattr(http_client, "post", post)
+    caching.configure(str(tmp_path))
+    try:
+        for _ in range(2):
+            metadata, _ = github_integration.request_metadata_batch_from_github_api(
+                "token", ["best-of/Original"], datetime(2021, 1, 1)
+            )
+            assert metadata["best-of/Original"].nameWithOwner == "best-of/renamed"
+
+        assert "owner0" in requests[0]["variables"]
+        assert requests[1]["variables"]["ids"] == ["R_1"]
+        assert "nodes(ids: $ids)" in requests[1]["query"]
+        assert "repository(" not in requests[1]["query"]
+        assert (
+            github_integration.resolve_github_id("best-of/original")
+            == "best-of/renamed"
+        )
+    finally:
+        caching.configure(None)
+
+
+def test_missing_node_is_requested_by_name(monkeypatch, tmp_path):
+    requests = []
+
+    def post(url, json, **kwargs):
+        requests.append(json)
+        if "id" in json["variables"]:
+            return httpx.Response(200, json={"data": {"node": None}})
+        github_info = {"id": "R_2", "nameWithOwner": "best-of/recreated"}
+        return httpx.Response(200, json={"data": {"repository": github_info}})
+
+    monkeypatch.setattr(http_client, "post", post)
+    caching.configure(str(tmp_path))
+    try:
+        github_integration.store_github_identity(
+            "best-of/recreated", Dict(id="R_1", nameWithOwner="best-of/recreated")
+        )
+        github_info = github_integration.request_metadata_from_github_api(
+            "token", "best-of/recreated", datetime(2021, 1, 1)
+        )
+        assert github_info.id == "R_2"
+        assert requests[0]["variables"]["id"] == "R_1"
+        assert requests[1]["variables"]["repo"] == "recreated"
+        assert github_integration.get_github_node_id("best-of/recreated") == "R_2"
+
+        # Repositories that are not found by name either are not returned
+        monkeypatch.setattr(
+            http_client,
+            "post",
+            lambda url, json, **kwargs: httpx.Response(
+                200, json={"data": {"repository": None}}
+            ),
+        )
+        assert (
+            github_integration.request_metadata_from_github_api(
+                "token", "best-of/deleted", datetime(2021, 1, 1)
+            )
+            is None
+        )
+    finally:
+        caching.configure(None)
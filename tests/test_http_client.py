@@ -0,0 +1,72 @@
+import time
+
+import httpx
+
+from best_of import http_client
+from best_of.http_client import RetryPolicy, parse_retry_after
+
+
+def test_retry_policy_headers():
+    retry_policy = RetryPolicy()
+
+    assert retry_policy.get_wait_time(0, {"Retry-After": "7"}) == 7
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+    reset_headers = {
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(int(time.time()) + 30),
+    }
+    assert retry_policy.should_retry(403, reset_headers)
+    assert 25 < retry_policy.get_wait_time(0, reset_headers) <= 31
+    assert not retry_policy.should_retry(403, {"X-RateLimit-Remaining": "10"})
+    assert not retry_policy.should_retry(404, {})
+
+
+def test_retry_policy_graphql_rate_limit():
+    retry_policy = RetryPolicy()
+
+    reset_headers = {
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(int(time.time()) + 30),
+    }
+    rate_limited = (
+        b'{"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]}'
+    )
+    assert retry_policy.should_retry(200, reset_headers, rate_limited)
+    assert 25 < retry_policy.get_wait_time(0, reset_headers) <= 31
+    # The last request of the quota succeeds
+    assert not retry_policy.should_retry(200, reset_headers, b'{"data": {}}')
+    assert not retry_policy.should_retry(
+        200, {"X-RateLimit-Remaining": "10"}, rate_limited
+    )
+
+
+def test_retry_policy_backoff():
+    retry_policy = RetryPolicy(backoff_factor=1, max_backoff=10)
+
+    assert retry_policy.should_retry(502, {})
+    assert 0.5 <= retry_policy.get_wait_time(0) <= 1
+    assert 4 <= retry_policy.get_wait_time(3) <= 8
+    assert 5 <= retry_policy.get_wait_time(10) <= 10
+
+
+def test_graphql_rate_limit_is_retried(monkeypatch):
+    reset_headers = {
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(int(time.time()) + 30),
+    }
+    responses = [
+        httpx.Response(
+            200, headers=reset_headers, json={"errors": [{"type": "RATE_LIMITED"}]}
+        ),
+        httpx.Response(200, json={"data": {"stars": 1}}),
+    ]
+    wait_times = []
+    monkeypatch.setattr(http_client, "send", lambda *args, **kwargs: responses.pop(0))
+    monkeypatch.setattr(time, "sleep", wait_times.append)
+
+    response = http_client.post(
+        "https://api.github.com/graphql", json={"query": "{ stars }"}
+    )
+    assert response.json() == {"data": {"stars": 1}}
+    assert len(wait_times) == 1 and wait_times[0] > 25
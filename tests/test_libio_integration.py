@@ -0,0 +1,84 @@
+import httpx
+from addict import Dict
+
+from best_of import caching, http_client
+from best_of.integrations import libio_integration
+
+
+def test_packages_are_prefetched_via_bulk_api(monkeypatch):
+    monkeypatch.setenv("LIBRARIES_API_KEY", "key")
+    requests = []
+
+    def request(method, url, **kwargs):
+        requests.append((method, url, kwargs))
+        if url.endswith("/check"):
+            return httpx.Response(
+                200,
+                json=[
+                    {"name": "Requests", "platform": "Pypi", "stars": 100},
+                    {"name": "react", "platform": "NPM", "stars": 200},
+                ],
+                request=httpx.Request(method, url),
+            )
+        return httpx.Response(404, request=httpx.Request(method, url))
+
+    monkeypatch.setattr(http_client, "request", request)
+
+    projects_info = [
+        Dict(pypi_id="requests"),
+        Dict(pypi_id="missing", npm_id="react"),
+        Dict(conda_id="conda-forge/numpy"),
+    ]
+    libio_integration.prefetch_packages_via_libio(projects_info)
+
+    assert [(method, url) for method, url, _ in requests] == [
+        ("POST", "https://libraries.io/api/check"),
+        ("POST", "https://libraries.io/api/check"),
+    ]
+    assert requests[0][2]["json"]["projects"] == [
+        {"name": "requests", "platform": "pypi"},
+        {"name": "missing", "platform": "pypi"},
+    ]
+    assert requests[0][2]["params"] == {"api_key": "key"}
+
+    for project_info in projects_info[:2]:
+        libio_integration.update_package_via_libio("pypi", project_info)
+    libio_integration.update_package_via_libio("npm", projects_info[1])
+
+    assert projects_info[0].star_count == 100
+    assert projects_info[1].star_count == 200
+    # Only the package that is missing in the bulk response is requested on its own
+    assert requests[-1][:2] == ("GET", "https://libraries.io/api/pypi/missing")
+    assert len(requests) == 3
+
+
+def test_libio_metadata_is_cached(monkeypatch, tmp_path):
+    monkeypatch.setenv("LIBRARIES_API_KEY", "key")
+    requested_urls = []
+
+    def request(method, url, **kwargs):
+        requested_urls.append(url)
+        return httpx.Response(
+            200, json={"stargazers_count": 10}, request=httpx.Request(method, url)
+        )
+
+    monkeypatch.setattr(http_client, "request", request)
+    caching.configure(str(tmp_path))
+    try:
+        for _ in range(2):
+            project_info = Dict(github_id="best-of/Repo")
+            libio_integration.update_repo_via_libio(project_info)
+            assert project_info.star_count == 10
+        assert requested_urls == ["https://libraries.io/api/github/best-of/Repo"]
+
+        # Cached packages are not part of the bulk requests
+        libio_integration.store_info("pypi/requests", Dict(stars=100))
+        libio_integration.prefetch_packages_via_libio([Dict(pypi_id="requests")])
+        assert len(requested_urls) == 1
+
+        libio_integration.configure(cache_ttl=-1)
+        libio_integration.update_repo_via_libio(Dict(github_id="best-of/repo"))
+        assert len(requested_urls) == 2
+    finally:
+        libio_integration.configure()
+        caching.configure(None)
@@ -0,0 +1,41 @@
+import httpx
+from addict import Dict
+
+from best_of import http_client
+from best_of.integrations import npm_integration
+
+
+def test_update_via_npm_bulk_api(monkeypatch):
+    requested_urls = []
+
+    def get(url, **kwargs):
+        requested_urls.append(url)
+        if url.endswith("/react,vue"):
+            return httpx.Response(
+                200,
+                json={
+                    "react": {"downloads": 100, "package": "react"},
+                    "vue": None,
+                },
+            )
+        return httpx.Response(200, json={"downloads": 10, "package": "@babel/core"})
+
+    monkeypatch.setattr(http_client, "get", get)
+
+    projects_info = [
+        Dict(npm_id="react"),
+        Dict(npm_id="vue"),
+        Dict(npm_id="@babel/core"),
+        Dict(npm_id="react", monthly_downloads=5),
+    ]
+    npm_integration.update_via_npm_bulk_api(projects_info)
+
+    assert len(requested_urls) == 2
+    assert requested_urls[0].endswith("/%40babel%2Fcore")
+    assert [project.npm_monthly_downloads for project in projects_info] == [
+        100,
+        {},
+        10,
+        100,
+    ]
+    assert projects_info[3].monthly_downloads == 105
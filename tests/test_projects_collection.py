@@ -0,0 +1,89 @@
+from addict import Dict
+
+from best_of import default_config, integrations, projects_collection
+from best_of.integrations import github_integration
+from best_of.integrations.base_integration import BaseIntegration
+
+
+class FakeIntegration(BaseIntegration):
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    def update_project_info(self, project_info: Dict) -> None:
+        project_info.star_count = int(project_info.fake_id) % 7
+
+    def generate_md_details(self, project: Dict, configuration: Dict) -> str:
+        return ""
+
+
+class FakeBatchIntegration(FakeIntegration):
+    batch_calls = 0
+
+    @property
+    def name(self) -> str:
+        return "fake_batch"
+
+    def update_project_info(self, project_info: Dict) -> None:
+        raise AssertionError("Projects are expected to be updated in batches.")
+
+    def prepare_project_info(self, project_info: Dict) -> None:
+        # Runs after FakeIntegration in the per-project stage
+        project_info.contributor_count = project_info.star_count + 1
+
+    def update_projects_info(self, projects_info: list) -> None:
+        FakeBatchIntegration.batch_calls += 1
+        for project_info in projects_info:
+            project_info.fork_count = int(project_info.fake_batch_id) * 2
+
+
+async def update_via_github_async(project_info, client, limiter):
+    pass
+
+
+def test_collect_projects_info_concurrent_order(monkeypatch):
+    monkeypatch.setattr(github_integration, "update_via_github", lambda _: None)
+    monkeypatch.setattr(
+        github_integration, "update_via_github_async", update_via_github_async
+    )
+    monkeypatch.setattr(
+        integrations,
+        "AVAILABLE_PACKAGE_MANAGER",
+        [FakeIntegration(), FakeBatchIntegration()],
+    )
+
+    projects = [
+        {
+            "name": f"project-{i}",
+            "homepage": "https://best-of.org",
+            "fake_id": str(i),
+            "fake_batch_id": str(i),
+        }
+        for i in range(50)
+    ]
+    categories = default_config.prepare_categories([])
+
+    sequential = projects_collection.collect_projects_info(
+        projects, categories, default_config.prepare_configuration({})
+    )
+    concurrent = projects_collection.collect_projects_info(
+        projects, categories, default_config.prepare_configuration({"max_workers": 8})
+    )
+    async_collected = projects_collection.collect_projects_info(
+        projects,
+        categories,
+        default_config.prepare_configuration({"async_collection": True}),
+    )
+
+    # One batch call per collection
+    assert FakeBatchIntegration.batch_calls == 3
+    assert all(
+        project.fork_count == int(project.fake_batch_id) * 2 for project in sequential
+    )
+    assert all(
+        project.contributor_count == project.star_count + 1 for project in sequential
+    )
+
+    expected = [project.to_dict() for project in sequential]
+    assert [project.to_dict() for project in concurrent] == expected
+    assert [project.to_dict() for project in async_collected] == expected
@@ -0,0 +1,67 @@
+import threading
+
+import httpx
+from addict import Dict
+
+from best_of import http_client
+from best_of.integrations import pypi_integration
+
+
+def test_pypistats_requests_are_queued(monkeypatch):
+    monkeypatch.delenv("LIBRARIES_API_KEY", raising=False)
+    released = threading.Event()
+
+    def get(url, **kwargs):
+        # Blocks until the update of the project is finished
+        assert released.wait(5)
+        return httpx.Response(200, json={"data": {"last_month": 100}})
+
+    monkeypatch.setattr(http_client, "get", get)
+
+    project_info = Dict(pypi_id="best-of", monthly_downloads=5)
+    assert pypi_integration.PypiIntegration().get_requested_hosts(project_info) == [
+        "pypistats.org"
+    ]
+    pypi_integration.start_pypistats_queue()
+    try:
+        # The queued requests do not hold a slot of the project update
+        assert not pypi_integration.PypiIntegration().get_requested_hosts(project_info)
+        pypi_integration.PypiIntegration().update_project_info(project_info)
+        assert not project_info.pypi_monthly_downloads
+        released.set()
+    finally:
+        pypi_integration.finish_pypistats_queue()
+
+    assert project_info.pypi_monthly_downloads == 100
+    assert project_info.monthly_downloads == 105
+
+    # Without a queue, the downloads are requested directly
+    project_info = Dict(pypi_id="best-of")
+    pypi_integration.PypiIntegration().update_project_info(project_info)
+    assert project_info.monthly_downloads == 100
+
+
+def test_monthly_downloads_from_dump(monkeypatch, tmp_path):
+    def get(url, **kwargs):
+        raise AssertionError("pypistats should not be requested")
+
+    monkeypatch.setattr(http_client, "get", get)
+
+    downloads_file = tmp_path / "pypi-downloads.csv"
+    downloads_file.write_text(
+        "project,num_downloads,other\n"
+        "best-of,100,x\n"
+        "Best_Of,20,x\n"
+        "lazydocs,5,x\n"
+    )
+    pypi_integration.configure(downloads_file=str(downloads_file))
+    try:
+        project_info = Dict(pypi_id="best.of")
+        pypi_integration.PypiIntegration().update_project_info(project_info)
+        assert project_info.pypi_monthly_downloads == 120
+
+        project_info = Dict(pypi_id="missing")
+        pypi_integration.PypiIntegration().update_project_info(project_info)
+        assert not project_info.monthly_downloads
+    finally:
+        pypi_integration.configure()
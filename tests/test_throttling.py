@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from best_of.throttling import HostConcurrencyLimiter, RateLimitBudget, RateLimiter
+
+
+def test_host_concurrency_limiter():
+    limiter = HostConcurrencyLimiter({"api.github.com": 2})
+    running = {"current": 0, "max": 0}
+
+    async def request() -> None:
+        async with limiter.limit("api.github.com", "libraries.io"):
+            running["current"] += 1
+            running["max"] = max(running["max"], running["current"])
+            await asyncio.sleep(0.01)
+            running["current"] -= 1
+
+    async def run() -> None:
+        await asyncio.gather(*[request() for _ in range(10)])
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+    assert running["max"] == 2
+
+
+def test_rate_limiter_spreads_requests():
+    rate_limiter = RateLimiter(10, 1)
+
+    assert rate_limiter.reserve() == 0
+    wait_times = [rate_limiter.reserve() for _ in range(3)]
+    assert wait_times == sorted(wait_times)
+    assert 0.25 < wait_times[-1] <= 0.3
+
+
+def test_rate_limit_budget_paces_until_reset():
+    budget = RateLimitBudget()
+    assert budget.reserve() == 0.0
+
+    budget.update(cost=10, remaining=100, reset_at=time.time() + 100)
+    # Enough budget for all pending requests
+    budget.set_pending(5)
+    assert budget.reserve() == 0.0
+
+    # 90 remaining points for 20 requests of 10 points: spread across the period
+    budget.set_pending(20)
+    assert budget.reserve() == 0.0
+    assert 10 < budget.reserve() < 14
+
+    budget.update(cost=10, remaining=5, reset_at=time.time() + 50)
+    assert 49 < budget.reserve() <= 51
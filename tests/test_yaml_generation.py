@@ -0,0 +1,29 @@
+from addict import Dict
+
+from best_of import caching, yaml_generation
+from best_of.integrations import github_integration
+
+
+def test_renamed_repos_are_resolved_with_cache_folder(monkeypatch, tmp_path):
+    def update_via_github(project):
+        project.github_url = "https://github.com/" + project.github_id
+        project.name = project.github_id.split("/")[1]
+
+    monkeypatch.setattr(github_integration, "update_via_github", update_via_github)
+
+    caching.configure(str(tmp_path))
+    github_integration.store_github_identity(
+        "best-of/original", Dict(id="R_1", nameWithOwner="best-of/renamed")
+    )
+    caching.configure(None)
+    try:
+        projects = yaml_generation.collect_github_projects(
+            ["best-of/original"],
+            excluded_github_ids=["best-of/renamed"],
+            cache_folder=str(tmp_path),
+        )
+    finally:
+        caching.configure(None)
+
+    # The excluded repo is found via its current name
+    assert projects == []